@@ -1,23 +1,64 @@
+import argparse
+import logging
+import os
 import sys
+
 from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QTimer
+
+from gui.perf import PhaseTimer
 
-from gui.main_window import MainWindow, get_light_stylesheet
-from db.repository import init_db
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Spent — personal expense tracker")
+    parser.add_argument("--db", help="SQLite database file to open (default: $SPENT_DB or ./spent.db)")
+    # leave Qt's own options (-style, -platform, ...) to QApplication
+    args, qt_args = parser.parse_known_args(argv[1:])
+    return args, argv[:1] + qt_args
 
 
 def main():
-    # Initialize database (create tables + default categories)
-    init_db()
+    args, qt_argv = parse_args(sys.argv)
+    logging.basicConfig(level=os.environ.get("SPENT_LOG_LEVEL", "WARNING").upper())
+    timer = PhaseTimer("startup")
+
+    from gui.main_window import MainWindow, get_light_stylesheet
+    from gui.startup import RecurringCatchUpWorker
+    from gui.async_query import default_runner
+    from db.repository import configure_database, init_db
+    timer.mark("imports")
 
-    app = QApplication(sys.argv)
+    app = QApplication(qt_argv)
 
     # Default theme: light neumorphic
     app.setStyleSheet(get_light_stylesheet())
+    timer.mark("qapplication")
+
+    # Create tables, run migrations, seed default categories. Recurring-rule
+    # catch-up runs in the background once the window is up.
+    configure_database(args.db)
+    init_db(apply_recurring=False)
+    timer.mark("init_db")
 
     window = MainWindow()
+    timer.mark("main_window")
     window.show()
+    window.startup_timer = timer
+
+    worker = RecurringCatchUpWorker()
+    worker.finished.connect(window.on_recurring_applied)
+    worker.failed.connect(window.on_recurring_failed)
+
+    def after_first_paint():
+        timer.mark("first_paint")
+        worker.start()
+
+    QTimer.singleShot(0, after_first_paint)
 
-    sys.exit(app.exec())
+    code = app.exec()
+    worker.wait()
+    default_runner().wait()
+    sys.exit(code)
 
 
 if __name__ == "__main__":
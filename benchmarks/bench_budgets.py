@@ -0,0 +1,116 @@
+"""Budget status: one aggregate statement vs the old per-budget SUM loop.
+
+    python -m benchmarks.bench_budgets [--budgets 100] [--transactions 500000]
+
+Builds a throwaway database, checks both implementations return identical
+status rows and prints the timings.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import insert, select, func
+
+import db.repository as repo
+from db.migrations import run_migrations
+from db.models import Base, Budget, Category, Transaction
+from db.rollups import suspended_triggers
+
+
+def legacy_budgets_with_status(ref_date: date):
+    """The pre-aggregation implementation: one SUM query per budget."""
+    with repo.SessionLocal() as session:
+        rows = session.execute(
+            select(Budget, Category).join(Category, Budget.category_id == Category.id).order_by(Budget.id)
+        ).all()
+        result = []
+        for b, cat in rows:
+            start_str, end_str = repo._get_cycle_window(b.cycle_day, ref_date)
+            spent = session.execute(
+                select(func.coalesce(func.sum(Transaction.amount), 0.0)).where(
+                    Transaction.type == "expense",
+                    Transaction.category_id == b.category_id,
+                    Transaction.date >= start_str,
+                    Transaction.date < end_str,
+                )
+            ).scalar_one() or 0.0
+            result.append((b.id, float(spent)))
+        return result
+
+
+def populate(engine, n_budgets: int, n_tx: int, seed: int = 7) -> None:
+    rnd = random.Random(seed)
+    first_day = date.today() - timedelta(days=730)
+    with engine.begin() as conn, suspended_triggers(conn):
+        conn.execute(insert(Category), [{"name": f"Cat {i}", "type": "expense"} for i in range(n_budgets)])
+        cat_ids = conn.execute(select(Category.id)).scalars().all()
+        conn.execute(insert(Budget), [
+            {"category_id": cid, "amount": rnd.uniform(100, 5000), "cycle_day": rnd.randint(1, 28)}
+            for cid in cat_ids
+        ])
+        batch = []
+        for _ in range(n_tx):
+            batch.append({
+                "date": (first_day + timedelta(days=rnd.randrange(730))).isoformat(),
+                "amount": round(rnd.uniform(1, 200), 2),
+                "type": "expense" if rnd.random() < 0.85 else "income",
+                "category_id": rnd.choice(cat_ids),
+                "payment_method": "Card",
+            })
+            if len(batch) == 10_000:
+                conn.execute(insert(Transaction), batch)
+                batch.clear()
+        if batch:
+            conn.execute(insert(Transaction), batch)
+
+
+def timed(fn, repeat: int):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - t0)
+    return result, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budgets", type=int, default=100)
+    parser.add_argument("--transactions", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo.configure_database(os.path.join(tmp, "bench.db"))
+        engine = repo.engine
+        Base.metadata.create_all(engine)
+        run_migrations(engine)
+
+        t0 = time.perf_counter()
+        populate(engine, args.budgets, args.transactions)
+        print(f"populated {args.budgets} budgets x {args.transactions} transactions in {time.perf_counter() - t0:.1f}s")
+
+        ref_date = date.today()
+        old, old_t = timed(lambda: legacy_budgets_with_status(ref_date), args.repeat)
+        new, new_t = timed(lambda: repo._budgets_with_status.uncached(ref_date), args.repeat)
+        repo.invalidate_query_cache()
+        repo.reset_cache_stats()
+        _, cached_t = timed(lambda: repo.get_budgets_with_status(ref_date), args.repeat)
+
+        assert [b_id for b_id, _ in old] == [b["id"] for b in new]
+        assert all(abs(spent - b["spent"]) < 1e-6 for (_, spent), b in zip(old, new))
+
+        print(f"per-budget loop : {old_t * 1000:8.1f} ms  ({len(old) + 1} queries)")
+        print(f"single statement: {new_t * 1000:8.1f} ms  (1 query)")
+        stats = repo.cache_stats()
+        print(f"query cache     : {cached_t * 1000:8.1f} ms  ({stats['hits']} hits / {stats['misses']} misses)")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""End-to-end GUI latency on generated databases, headless.
+
+    python -m benchmarks.bench_gui [--sizes 1000,100000,1000000] [--repeat 3] [--save results.json]
+
+Runs `MainWindow` on the offscreen Qt platform against a copy of a
+scripts/seed_demo.py template per size and times, from the triggering call
+until the window is idle again and has been rendered:
+
+- startup: constructing and showing the window;
+- switch:<page> (first): the first visit, which builds the page and loads its data;
+- switch:<page>: a later visit;
+- submit: adding a transaction through the form;
+- filter: applying a category + type + date filter to the transaction list.
+
+"Idle" means no background query is waiting for its result and no coalesced
+refresh is scheduled. Each timing is followed by a breakdown of the stages
+recorded in gui/perf.py while it ran (query.* run on worker threads and can
+overlap GUI-thread stages), plus "render", the final synchronous paint.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QDate  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+import db.repository as repo  # noqa: E402
+from gui import perf  # noqa: E402
+from gui.async_query import default_runner  # noqa: E402
+from scripts.seed_demo import copy_template  # noqa: E402
+
+from .bench_repository import END  # noqa: E402
+
+SIZES = [1_000, 100_000, 1_000_000]
+PAGES = ["dashboard", "transactions", "categories", "budgets", "reports", "settings"]
+SETTLE_TIMEOUT = 120.0
+
+Breakdown = Dict[str, float]
+
+
+def settle(app: QApplication, window, timeout: float = SETTLE_TIMEOUT) -> None:
+    """Process events until nothing is pending for two rounds in a row
+    (views ask for their first page from a zero-delay timer)."""
+    runner = default_runner()
+    deadline = time.perf_counter() + timeout
+    quiet = 0
+    while quiet < 2:
+        app.processEvents()
+        if runner.busy() or window.refresh.has_pending():
+            quiet = 0
+            time.sleep(0.001)
+        else:
+            quiet += 1
+        if time.perf_counter() > deadline:
+            raise TimeoutError("GUI did not settle")
+
+
+def timed_step(app: QApplication, window_fn: Callable, action: Callable) -> Tuple[float, Breakdown]:
+    """Run `action`, wait for the window to settle and render it; return the
+    total seconds and the per-stage seconds recorded meanwhile."""
+    before = perf.stage_stats()
+    t0 = time.perf_counter()
+    action()
+    window = window_fn()
+    settle(app, window)
+    t_render = time.perf_counter()
+    window.grab()
+    end = time.perf_counter()
+
+    breakdown: Breakdown = {}
+    for name, stats in perf.stage_stats().items():
+        spent = stats["total"] - before.get(name, {}).get("total", 0.0)
+        if spent > 0:
+            breakdown[name] = spent
+    breakdown["render"] = end - t_render
+    return end - t0, breakdown
+
+
+def run_once(app: QApplication) -> Dict[str, Tuple[float, Breakdown]]:
+    from gui.main_window import MainWindow
+
+    results: Dict[str, Tuple[float, Breakdown]] = {}
+    holder: List = []
+
+    def start():
+        with perf.measure("main_window.init"):
+            window = MainWindow()
+        window.show()
+        holder.append(window)
+
+    results["startup"] = timed_step(app, lambda: holder[0], start)
+    window = holder[0]
+    buttons = dict(zip(PAGES, window.nav_buttons))
+
+    for visit in ("first", "again"):
+        for name in PAGES:
+            label = f"switch:{name}" + (" (first)" if visit == "first" else "")
+            results[label] = timed_step(app, lambda: window, buttons[name].click)
+
+    buttons["transactions"].click()
+    settle(app, window)
+
+    def submit():
+        form = window.transaction_form
+        form.date_edit.setDate(QDate(END.year, END.month, END.day))
+        form.amount_edit.setText("42.50")
+        form.add_button.click()
+
+    results["submit"] = timed_step(app, lambda: window, submit)
+
+    def apply_filter():
+        page = window.transaction_list
+        page.date_from.setDate(QDate(END.year - 1, END.month, END.day))
+        page.date_to.setDate(QDate(END.year, END.month, END.day))
+        page.category_filter.setCurrentText("Food")
+        page.type_filter.setCurrentText("Expense")
+        page.apply_btn.click()
+
+    results["filter"] = timed_step(app, lambda: window, apply_filter)
+
+    window.refresh.detach()
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+    return results
+
+
+def run_size(app: QApplication, size: int, repeat: int) -> Dict[str, Dict]:
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = copy_template(size, os.path.join(tmp, "bench.db"), end=END)
+        repo.configure_database(path)
+        repo.init_db(apply_recurring=False)
+        try:
+            for _ in range(repeat):
+                repo.invalidate_query_cache()  # every window starts cold
+                runs.append(run_once(app))
+        finally:
+            default_runner().wait()
+            repo.engine.dispose()
+
+    summary: Dict[str, Dict] = {}
+    for step in runs[0]:
+        totals = [run[step][0] for run in runs]
+        stages = sorted({name for run in runs for name in run[step][1]})
+        summary[step] = {
+            "seconds": statistics.median(totals),
+            "stages": {name: statistics.median(run[step][1].get(name, 0.0) for run in runs) for name in stages},
+        }
+    return summary
+
+
+def print_summary(size: int, summary: Dict[str, Dict], top: int) -> None:
+    print(f"\n{size:,} rows")
+    for step, result in summary.items():
+        stages = sorted(result["stages"].items(), key=lambda kv: kv[1], reverse=True)[:top]
+        breakdown = ", ".join(f"{name} {sec * 1000:.1f}" for name, sec in stages if sec >= 0.0001)
+        print(f"  {step:<26} {result['seconds'] * 1000:9.1f} ms   {breakdown}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="comma-separated row counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=4, help="stages shown per step")
+    parser.add_argument("--save", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    from gui.main_window import get_light_stylesheet
+    app.setStyleSheet(get_light_stylesheet())
+
+    report = {"platform": app.platformName(), "repeat": args.repeat, "results": {}}
+    for size in (int(s) for s in args.sizes.split(",")):
+        summary = run_size(app, size, args.repeat)
+        report["results"][str(size)] = summary
+        print_summary(size, summary, args.top)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nsaved {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Commit latency and mixed read/write throughput per SQLite tuning profile.
+
+    python -m benchmarks.bench_pragmas [--commits 300] [--seconds 3] [--readers 2]
+
+For every profile in db/pragmas.py a throwaway database is seeded, then:
+
+- commit latency: single-row insert + commit, as `add_transaction` does;
+- mixed load: one writer committing single rows while reader threads run the
+  expense-by-category report, for a fixed time. "locked" counts operations
+  that failed with ``database is locked``.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from db import pragmas
+from db.aggregation import aggregate
+from db.connection import create_db_engine
+from db.migrations import run_migrations
+from db.models import Base, Category, Transaction
+from db.rollups import suspended_triggers
+
+
+def make_engine(path: str, profile: str):
+    engine = create_db_engine(path, lambda: profile)
+    Base.metadata.create_all(engine)
+    run_migrations(engine)
+    return engine
+
+
+def seed(engine, n_tx: int, seed: int = 11) -> None:
+    rnd = random.Random(seed)
+    with engine.begin() as conn, suspended_triggers(conn):
+        conn.execute(insert(Category), [{"name": f"Cat {i}", "type": "expense"} for i in range(20)])
+        conn.execute(insert(Transaction), [
+            {
+                "date": f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+                "amount": round(rnd.uniform(1, 200), 2),
+                "type": "expense",
+                "category_id": rnd.randint(1, 20),
+            }
+            for _ in range(n_tx)
+        ])
+
+
+def _write_one(Session, rnd: random.Random) -> None:
+    with Session() as session:
+        session.add(Transaction(
+            date=f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+            amount=round(rnd.uniform(1, 200), 2),
+            type="expense",
+            category_id=rnd.randint(1, 20),
+        ))
+        session.commit()
+
+
+def commit_latency(Session, commits: int):
+    rnd = random.Random(3)
+    samples = []
+    for _ in range(commits):
+        t0 = time.perf_counter()
+        _write_one(Session, rnd)
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def mixed_load(Session, seconds: float, readers: int):
+    stop = threading.Event()
+    counts = {"writes": 0, "reads": 0, "locked": 0}
+    lock = threading.Lock()
+
+    def bump(name):
+        with lock:
+            counts[name] += 1
+
+    def writer():
+        rnd = random.Random(5)
+        while not stop.is_set():
+            try:
+                _write_one(Session, rnd)
+                bump("writes")
+            except OperationalError:
+                bump("locked")
+
+    def reader():
+        while not stop.is_set():
+            try:
+                with Session() as session:
+                    aggregate(session, ["category"], type_="expense", use_rollups=False)
+                bump("reads")
+            except OperationalError:
+                bump("locked")
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    return {name: value / seconds if name != "locked" else value for name, value in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transactions", type=int, default=50000)
+    parser.add_argument("--commits", type=int, default=300)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--readers", type=int, default=2)
+    args = parser.parse_args()
+
+    print(f"{'profile':<10} {'commit p50':>11} {'commit p95':>11} {'writes/s':>9} {'reads/s':>9} {'locked':>7}")
+    for profile in pragmas.PROFILES:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = make_engine(os.path.join(tmp, "bench.db"), profile)
+            Session = sessionmaker(bind=engine)
+            seed(engine, args.transactions)
+
+            p50, p95 = commit_latency(Session, args.commits)
+            mixed = mixed_load(Session, args.seconds, args.readers)
+            print(
+                f"{profile:<10} {p50 * 1000:9.2f}ms {p95 * 1000:9.2f}ms "
+                f"{mixed['writes']:9.0f} {mixed['reads']:9.1f} {mixed['locked']:7d}"
+            )
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Repository benchmarks across data sizes, with a JSON baseline to compare against.
+
+    python -m benchmarks.bench_repository [--sizes 1000,100000,1000000] [--repeat 3]
+                                          [--save baseline.json] [--compare baseline.json]
+
+Every public read and bulk-write path of db/repository.py runs against a
+copy of a scripts/seed_demo.py template per size. The data is fixed (seed
+and end date), so runs on different days stay comparable. For each function
+the benchmark records:
+
+- peak_kb: tracemalloc peak of a first, warm-up run (Python allocations only);
+- queries: SQL statements executed during that run (an executemany counts once);
+- seconds: best wall time of the `--repeat` runs after it (the least noisy
+  estimate on a busy machine).
+
+The query cache is cleared before every run, so the numbers are for the
+queries themselves and not for cache hits.
+
+`--compare` prints the ratio to a saved baseline for each number. It exits
+with status 1 when a time or memory figure grows by more than `--tolerance`
+(and by a minimum absolute amount, so tiny timings aren't just noise) or
+when the query count grows at all.
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from itertools import islice
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event
+
+import db.repository as repo
+from scripts.seed_demo import copy_template
+
+SIZES = [1_000, 100_000, 1_000_000]
+END = date(2025, 12, 31)  # fixed, so templates and baselines don't change daily
+IMPORT_ROWS = 10_000
+RECURRING_RULES = 20
+
+MIN_SECONDS_DELTA = 0.005
+MIN_PEAK_KB_DELTA = 1024
+
+
+class Context:
+    """Per-size state handed to every case."""
+
+    def __init__(self, workdir: str):
+        self.workdir = workdir
+        self.import_file = os.path.join(workdir, "import.csv")
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.workdir, name)
+
+
+class Case:
+    def __init__(self, name: str, run: Callable[[Context], object], setup: Optional[Callable[[Context], None]] = None):
+        self.name = name
+        self.run = run
+        self.setup = setup
+
+
+def _add_overdue_rules(ctx: Context) -> None:
+    start = (END - timedelta(days=365)).isoformat()
+    for i in range(RECURRING_RULES):
+        repo.create_recurring_rule({
+            "type": "expense", "amount": 10.0 + i, "category": "General",
+            "every": "weekly", "interval": 1, "next_date": start,
+        })
+
+
+_last_month = (END.replace(day=1).isoformat(), END.isoformat())
+
+# reads first: the write cases at the end grow the table
+CASES: List[Case] = [
+    Case("list_transactions", lambda ctx: repo.list_transactions()),
+    Case("filter_transactions[last month]", lambda ctx: repo.filter_transactions(*_last_month)),
+    Case("filter_transactions[category]", lambda ctx: repo.filter_transactions(category="Travel")),
+    Case("list_transactions_page", lambda ctx: repo.list_transactions_page(limit=200)),
+    Case("count_transactions", lambda ctx: repo.count_transactions(type_="expense")),
+    Case("get_totals", lambda ctx: repo.get_totals()),
+    Case("get_expense_by_category_summary", lambda ctx: repo.get_expense_by_category_summary()),
+    Case("get_monthly_income_expense_summary", lambda ctx: repo.get_monthly_income_expense_summary()),
+    Case("get_balance_timeseries", lambda ctx: repo.get_balance_timeseries()),
+    Case("get_budgets_with_status", lambda ctx: repo.get_budgets_with_status(END)),
+    Case("export_transactions_csv", lambda ctx: repo.export_transactions_csv(ctx.path("export.csv"))),
+    Case("export_transactions_ndjson", lambda ctx: repo.export_transactions_ndjson(ctx.path("export.ndjson"))),
+    Case("import_transactions_csv", lambda ctx: repo.import_transactions_csv(ctx.import_file)),
+    Case("apply_recurring_rules", lambda ctx: repo.apply_recurring_rules(END.isoformat()), setup=_add_overdue_rules),
+]
+
+
+class QueryCounter:
+    """Counts statements executed on the repository engine while active."""
+
+    def __init__(self):
+        self.count = 0
+
+    def _on_execute(self, *_args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(repo.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(repo.engine, "before_cursor_execute", self._on_execute)
+
+
+def measure(case: Case, ctx: Context, repeat: int) -> Dict[str, float]:
+    # the traced run goes first and doubles as the warm-up for the timed ones
+    if case.setup:
+        case.setup(ctx)
+    repo.invalidate_query_cache()
+    tracemalloc.start()
+    try:
+        with QueryCounter() as counter:
+            case.run(ctx)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    samples = []
+    for _ in range(repeat):
+        if case.setup:
+            case.setup(ctx)
+        repo.invalidate_query_cache()
+        t0 = time.perf_counter()
+        case.run(ctx)
+        samples.append(time.perf_counter() - t0)
+    return {"seconds": min(samples), "peak_kb": peak // 1024, "queries": counter.count}
+
+
+def _write_import_file(ctx: Context) -> None:
+    with open(ctx.import_file, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=repo.EXPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(islice(repo.iter_transactions(), IMPORT_ROWS))
+
+
+def run_size(size: int, repeat: int, only: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        ctx = Context(tmp)
+        copy_template(size, ctx.path("bench.db"), end=END)
+        repo.configure_database(ctx.path("bench.db"))
+        repo.init_db(apply_recurring=False)
+        _write_import_file(ctx)
+        try:
+            for case in CASES:
+                if only and not any(name in case.name for name in only):
+                    continue
+                results[case.name] = measure(case, ctx, repeat)
+                r = results[case.name]
+                print(f"  {case.name:<38} {r['seconds'] * 1000:10.1f} ms {r['peak_kb']:>10,} KB {r['queries']:>6}")
+        finally:
+            repo.engine.dispose()
+    return results
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Print current vs baseline side by side; return the regressions."""
+    regressions = []
+    for size, cases in current["results"].items():
+        base_cases = baseline.get("results", {}).get(size)
+        if not base_cases:
+            continue
+        print(f"\n{int(size):,} rows vs baseline")
+        for name, r in cases.items():
+            b = base_cases.get(name)
+            if not b:
+                continue
+            t_ratio = r["seconds"] / b["seconds"] if b["seconds"] else 1.0
+            m_ratio = r["peak_kb"] / b["peak_kb"] if b["peak_kb"] else 1.0
+            flags = []
+            if t_ratio > 1 + tolerance and r["seconds"] - b["seconds"] > MIN_SECONDS_DELTA:
+                flags.append("time")
+            if m_ratio > 1 + tolerance and r["peak_kb"] - b["peak_kb"] > MIN_PEAK_KB_DELTA:
+                flags.append("memory")
+            if r["queries"] > b["queries"]:
+                flags.append("queries")
+            print(
+                f"  {name:<38} time x{t_ratio:5.2f}  memory x{m_ratio:5.2f}  "
+                f"queries {b['queries']}->{r['queries']}  {'REGRESSION: ' + ', '.join(flags) if flags else ''}"
+            )
+            regressions += [f"{size} {name}: {flag}" for flag in flags]
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="comma-separated row counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", action="append", help="run cases whose name contains this (repeatable)")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare against a JSON file written by --save")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative growth (default 0.25)")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+    for size in (int(s) for s in args.sizes.split(",")):
+        print(f"{size:,} rows{'':<28} {'time':>13} {'peak':>13} {'queries':>6}")
+        report["results"][str(size)] = run_size(size, args.repeat, args.only)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nsaved {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s)")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
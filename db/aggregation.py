@@ -0,0 +1,113 @@
+"""SQL-side aggregation for reports.
+
+Report requests are compiled into a single ``GROUP BY`` / ``SUM`` statement
+(plus a window function for running totals) so only the aggregated rows
+leave SQLite, instead of every `Transaction` being loaded into Python.
+
+Requests that only need month / type / category granularity are answered
+from the trigger-maintained ``monthly_rollups`` table (db/rollups.py).
+"""
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import select, func, case
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from .models import Transaction, Category, MonthlyRollup
+
+
+# name -> SQL expression a report can be grouped by
+DIMENSIONS = {
+    "month": func.substr(Transaction.date, 1, 7),
+    "date": Transaction.date,
+    "category": func.coalesce(Category.name, "Uncategorized"),
+    "type": Transaction.type,
+    "payment_method": func.coalesce(Transaction.payment_method, ""),
+}
+
+# the subset of DIMENSIONS monthly_rollups can answer
+ROLLUP_DIMENSIONS = {
+    "month": MonthlyRollup.month,
+    "category": func.coalesce(Category.name, "Uncategorized"),
+    "type": MonthlyRollup.type,
+}
+
+
+def _signed(type_col, amount_col):
+    # income counts positive, everything else negative (same rule as the balance)
+    return case((type_col == "income", amount_col), else_=-amount_col)
+
+
+def _can_use_rollups(group_by: Sequence[str], date_from, date_to, payment_method) -> bool:
+    return (
+        not date_from
+        and not date_to
+        and not payment_method
+        and all(d in ROLLUP_DIMENSIONS for d in group_by)
+    )
+
+
+def build_aggregate_query(
+    group_by: Sequence[str] = (),
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    type_: Optional[str] = None,
+    category: Optional[str] = None,
+    payment_method: Optional[str] = None,
+    signed: bool = False,
+    cumulative: bool = False,
+    use_rollups: bool = True,
+) -> Select:
+    """Compile a report request into one SELECT.
+
+    Columns: one per `group_by` dimension (in order), then ``total`` (sum of
+    amounts, or of signed amounts when `signed`), ``count`` and, when
+    `cumulative`, ``running_total`` ordered by the group-by dimensions.
+    Date bounds are inclusive ("YYYY-MM-DD").
+    """
+    unknown = [d for d in group_by if d not in DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown report dimension(s): {', '.join(unknown)}")
+
+    if use_rollups and _can_use_rollups(group_by, date_from, date_to, payment_method):
+        table, dim_map = MonthlyRollup, ROLLUP_DIMENSIONS
+        amount, count = MonthlyRollup.total, func.coalesce(func.sum(MonthlyRollup.tx_count), 0)
+        category_id = MonthlyRollup.category_id
+    else:
+        table, dim_map = Transaction, DIMENSIONS
+        amount, count = Transaction.amount, func.count(Transaction.id)
+        category_id = Transaction.category_id
+
+    dims = [dim_map[d].label(d) for d in group_by]
+    if signed:
+        amount = _signed(table.type, amount)
+    total = func.coalesce(func.sum(amount), 0.0)
+
+    columns = dims + [total.label("total"), count.label("count")]
+    if cumulative:
+        columns.append(func.sum(total).over(order_by=dims).label("running_total"))
+
+    stmt = select(*columns).select_from(table)
+    if "category" in group_by or category:
+        stmt = stmt.join(Category, category_id == Category.id, isouter=True)
+
+    if date_from:
+        stmt = stmt.where(Transaction.date >= date_from)
+    if date_to:
+        stmt = stmt.where(Transaction.date <= date_to)
+    if type_:
+        stmt = stmt.where(table.type == type_)
+    if category:
+        stmt = stmt.where(Category.name == category)
+    if payment_method:
+        stmt = stmt.where(Transaction.payment_method == payment_method)
+
+    if dims:
+        stmt = stmt.group_by(*dims).order_by(*dims)
+    return stmt
+
+
+def aggregate(session: Session, group_by: Sequence[str] = (), **options) -> List[Dict]:
+    """Run `build_aggregate_query` and return its rows as dicts."""
+    stmt = build_aggregate_query(group_by, **options)
+    return [dict(row._mapping) for row in session.execute(stmt)]
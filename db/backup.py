@@ -0,0 +1,116 @@
+"""Consistent online backups through SQLite's backup API.
+
+`backup_database` copies the live database page by page from an open
+connection, so the copy is a consistent snapshot even while the app keeps
+writing (SQLite restarts the copy if the source changes under it), and a
+large file is copied in small steps that can report progress. The result is
+written next to the destination, checked with ``PRAGMA integrity_check`` and
+only then moved (or gzip-compressed) into place.
+
+`stage_restore` prepares the other direction: it unpacks and validates a
+backup next to the live database so the swap itself is a single rename.
+"""
+import gzip
+import os
+import shutil
+import sqlite3
+import tempfile
+from typing import Callable, List, Optional
+
+PAGES_PER_STEP = 1024
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class BackupError(Exception):
+    pass
+
+
+def integrity_problems(path: str) -> List[str]:
+    """Messages from ``PRAGMA integrity_check`` (empty when the file is sound).
+
+    Also switches the file to the rollback journal: a copy of a WAL database
+    is still flagged as WAL and would grow -wal/-shm side files next to it.
+    """
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode = DELETE")
+        rows = [r[0] for r in conn.execute("PRAGMA integrity_check").fetchall()]
+    except sqlite3.DatabaseError as e:
+        return [str(e)]
+    finally:
+        conn.close()
+    return [] if rows == ["ok"] else rows
+
+
+def backup_database(
+    source: sqlite3.Connection,
+    dest_path: str,
+    compress: bool = False,
+    progress: Optional[ProgressCallback] = None,
+    pages_per_step: int = PAGES_PER_STEP,
+) -> str:
+    """Back up `source` to `dest_path` (gzip'd when `compress` or the name
+    ends in .gz) and return the path written. `progress(done, total)` is
+    called with page counts after every step."""
+    compress = compress or dest_path.endswith(".gz")
+    if compress and not dest_path.endswith(".gz"):
+        dest_path += ".gz"
+    partial = (dest_path[:-3] if compress else dest_path) + ".partial"
+
+    def on_step(_status, remaining, total):
+        if progress:
+            progress(total - remaining, total)
+
+    target = sqlite3.connect(partial)
+    try:
+        source.backup(target, pages=pages_per_step, progress=on_step)
+    finally:
+        target.close()
+
+    try:
+        problems = integrity_problems(partial)
+        if problems:
+            raise BackupError("backup failed integrity check: " + "; ".join(problems[:5]))
+
+        if compress:
+            with open(partial, "rb") as src, gzip.open(partial + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            os.replace(partial + ".gz", dest_path)
+        else:
+            os.replace(partial, dest_path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return dest_path
+
+
+def stage_restore(backup_path: str, dest_dir: Optional[str] = None) -> str:
+    """Copy (or gunzip) `backup_path` to a temporary file in `dest_dir` and
+    check that it is a sound Spent database. Returns the staged path; the
+    caller renames it into place or deletes it."""
+    if not os.path.isfile(backup_path):
+        raise BackupError(f"{backup_path} does not exist")
+    fd, staged = tempfile.mkstemp(prefix=".spent-restore-", suffix=".db", dir=dest_dir)
+    try:
+        with os.fdopen(fd, "wb") as dst:
+            opener = gzip.open if backup_path.endswith(".gz") else open
+            with opener(backup_path, "rb") as src:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+
+        problems = integrity_problems(staged)
+        if problems:
+            raise BackupError("not a valid database: " + "; ".join(problems[:5]))
+        conn = sqlite3.connect(staged)
+        try:
+            has_transactions = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transactions'"
+            ).fetchone()
+        finally:
+            conn.close()
+        if not has_transactions:
+            raise BackupError("not a Spent database (no transactions table)")
+    except BaseException:
+        os.remove(staged)
+        raise
+    return staged
@@ -0,0 +1,79 @@
+"""Where the database lives and how engines for it are built.
+
+The database path comes from, in order: an explicit argument (e.g. the
+``--db`` flag of app.py), the ``SPENT_DB`` environment variable, and finally
+``spent.db`` in the current directory. ``:memory:`` gives a private
+in-memory database (one shared connection, so every session sees the same
+data, handed to one thread at a time), which is what the test suite uses.
+"""
+import os
+import threading
+from typing import Callable, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+
+from . import pragmas
+
+DB_PATH_ENV = "SPENT_DB"
+DEFAULT_DB_PATH = "spent.db"
+MEMORY = ":memory:"
+
+
+def resolve_db_path(path: Optional[str] = None) -> str:
+    """Absolute path of the database to open (``:memory:`` is kept as is)."""
+    path = path or os.environ.get(DB_PATH_ENV) or DEFAULT_DB_PATH
+    return path if path == MEMORY else os.path.abspath(os.path.expanduser(path))
+
+
+class _ConnectionLock:
+    """Hands the single in-memory connection to one thread at a time.
+
+    Re-entrant for the holding thread (a repository call may check the
+    connection out again while it still holds it); released when the last
+    checkout is returned, whichever thread returns it.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._owner: Optional[int] = None
+        self._depth = 0
+
+    def acquire(self, *_args) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            while self._owner not in (None, me):
+                self._cond.wait()
+            self._owner = me
+            self._depth += 1
+
+    def release(self, *_args) -> None:
+        with self._cond:
+            self._depth -= 1
+            if self._depth <= 0:
+                self._owner, self._depth = None, 0
+                self._cond.notify_all()
+
+
+def create_db_engine(path: str, get_profile: Callable[[], str]) -> Engine:
+    """Engine for `path` with the PRAGMA profile `get_profile()` applied on connect.
+
+    Connections are created with check_same_thread=False: the GUI calls the
+    repository from worker threads. For a file, each call uses its own
+    session and pooled connection. ``:memory:`` has just one connection,
+    shared by every thread, so a checkout waits until no other thread holds
+    it; otherwise one thread's rollback-on-return or commit would end
+    another thread's transaction.
+    """
+    connect_args = {"check_same_thread": False}
+    if path == MEMORY:
+        # every new connection would be a new, empty database
+        engine = create_engine("sqlite://", future=True, connect_args=connect_args, poolclass=StaticPool)
+        lock = _ConnectionLock()
+        event.listen(engine, "checkout", lock.acquire)
+        event.listen(engine, "checkin", lock.release)
+    else:
+        engine = create_engine(f"sqlite:///{path}", future=True, connect_args=connect_args)
+    pragmas.install(engine, get_profile)
+    return engine
@@ -0,0 +1,218 @@
+"""SQL statement instrumentation and slow-query log.
+
+When enabled, cursor-execute hooks on the repository engine time every
+statement and attribute it to the repository function that issued it (the
+outermost `db.repository` function on the stack, so a cached wrapper or a
+helper counts towards the public call). Statements slower than the
+threshold are logged to the ``spent.sql.slow`` logger together with their
+``EXPLAIN QUERY PLAN``, and the most recent ones are kept for inspection.
+
+Switch it on with ``SPENT_SQL_TRACE=1`` (threshold: ``SPENT_SLOW_QUERY_MS``,
+default 100; log file: ``SPENT_SLOW_QUERY_LOG``) or the ``sql_trace`` /
+``slow_query_ms`` settings; the environment wins. When off, no hooks are
+installed at all, so there is no per-statement cost.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+TRACE_ENV = "SPENT_SQL_TRACE"
+SLOW_MS_ENV = "SPENT_SLOW_QUERY_MS"
+SLOW_LOG_ENV = "SPENT_SLOW_QUERY_LOG"
+DEFAULT_SLOW_MS = 100.0
+SLOW_QUERIES_KEPT = 50
+
+_REPOSITORY = f"{__package__}.repository"
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+slow_log = logging.getLogger("spent.sql.slow")
+
+_engine: Optional[Engine] = None
+_enabled = False
+_slow_ms = DEFAULT_SLOW_MS
+_lock = threading.Lock()
+_stats: Dict[str, List[float]] = {}  # function -> [count, total s, max s, slow count]
+_slow: Deque[Dict] = deque(maxlen=SLOW_QUERIES_KEPT)
+
+
+# ========== CONFIGURATION ==========
+
+def settings_from_env() -> Tuple[Optional[bool], Optional[float]]:
+    """(enabled, slow_ms) from the environment; None where unset/invalid."""
+    raw = (os.environ.get(TRACE_ENV) or "").strip().lower()
+    enabled = True if raw in ("1", "true", "yes", "on") else False if raw in ("0", "false", "no", "off") else None
+    try:
+        slow_ms = float(os.environ[SLOW_MS_ENV])
+    except (KeyError, ValueError):
+        slow_ms = None
+    return enabled, slow_ms
+
+
+def configure_from_env() -> None:
+    """Apply the environment (tracing stays off when it's unset)."""
+    enabled, slow_ms = settings_from_env()
+    configure(bool(enabled), slow_ms)
+
+
+def attach(engine: Engine) -> None:
+    """Instrument `engine` (and stop instrumenting the previous one)."""
+    global _engine
+    if _enabled and _engine is not None:
+        _remove_hooks(_engine)
+    _engine = engine
+    if _enabled:
+        _add_hooks(engine)
+
+
+def configure(enabled: bool, slow_ms: Optional[float] = None) -> None:
+    global _enabled, _slow_ms
+    if slow_ms is not None:
+        _slow_ms = max(0.0, float(slow_ms))
+    if enabled == _enabled:
+        return
+    _enabled = enabled
+    if _engine is not None:
+        (_add_hooks if enabled else _remove_hooks)(_engine)
+    if enabled:
+        _open_slow_log_file()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def slow_query_ms() -> float:
+    return _slow_ms
+
+
+def _open_slow_log_file() -> None:
+    path = os.environ.get(SLOW_LOG_ENV)
+    if not path or any(getattr(h, "baseFilename", None) == os.path.abspath(path) for h in slow_log.handlers):
+        return
+    handler = logging.FileHandler(path, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    slow_log.addHandler(handler)
+    slow_log.setLevel(logging.INFO)
+
+
+# ========== HOOKS ==========
+
+def _add_hooks(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_execute):
+        event.listen(engine, "before_cursor_execute", _before_execute)
+        event.listen(engine, "after_cursor_execute", _after_execute)
+
+
+def _remove_hooks(engine: Engine) -> None:
+    if event.contains(engine, "before_cursor_execute", _before_execute):
+        event.remove(engine, "before_cursor_execute", _before_execute)
+        event.remove(engine, "after_cursor_execute", _after_execute)
+
+
+def _caller() -> str:
+    """Outermost repository function in the current call stack."""
+    name = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_globals.get("__name__") == _REPOSITORY:
+            code = frame.f_code
+            if "<locals>" not in code.co_qualname:  # skip decorator wrappers
+                name = code.co_name
+        elif name is not None:
+            break  # left the repository: `name` is its entry point
+        frame = frame.f_back
+    return name or "<outside repository>"
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    context._spent_trace = (_caller(), time.perf_counter())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    trace = getattr(context, "_spent_trace", None)
+    if trace is None:
+        return  # hooks were added while this statement ran
+    function, t0 = trace
+    elapsed = time.perf_counter() - t0
+    slow = elapsed * 1000 >= _slow_ms
+
+    with _lock:
+        entry = _stats.get(function)
+        if entry is None:
+            entry = _stats[function] = [0, 0.0, 0.0, 0]
+        entry[0] += 1
+        entry[1] += elapsed
+        entry[2] = max(entry[2], elapsed)
+        entry[3] += slow
+
+    if slow:
+        _record_slow(cursor, function, elapsed, statement, parameters, executemany)
+
+
+def explain(dbapi_connection, statement: str, parameters=()) -> List[str]:
+    """``EXPLAIN QUERY PLAN`` of `statement`, one line per plan step."""
+    cursor = dbapi_connection.cursor()
+    try:
+        rows = cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ()).fetchall()
+    finally:
+        cursor.close()
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _unused, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return lines
+
+
+def _record_slow(cursor, function: str, elapsed: float, statement: str, parameters, executemany: bool) -> None:
+    plan: List[str] = []
+    if not executemany and statement.lstrip().split(None, 1)[0].upper() in _EXPLAINABLE:
+        try:
+            plan = explain(cursor.connection, statement, parameters)
+        except Exception as e:  # never let diagnostics break the query
+            plan = [f"(no plan: {e})"]
+    entry = {
+        "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "function": function,
+        "ms": elapsed * 1000,
+        "statement": " ".join(statement.split()),
+        "executemany": executemany,
+        "plan": plan,
+    }
+    with _lock:
+        _slow.append(entry)
+    slow_log.warning(
+        "slow query: %.1f ms in %s: %s%s",
+        entry["ms"], function, entry["statement"][:500],
+        "".join(f"\n    {line}" for line in plan),
+    )
+
+
+# ========== RESULTS ==========
+
+def query_stats() -> Dict[str, Dict[str, float]]:
+    """Per repository function: statement count, total/max ms and slow count."""
+    with _lock:
+        return {
+            name: {"count": count, "total_ms": total * 1000, "max_ms": max_ * 1000, "slow": slow}
+            for name, (count, total, max_, slow) in sorted(_stats.items())
+        }
+
+
+def slow_queries() -> List[Dict]:
+    """The most recent slow statements, newest last."""
+    with _lock:
+        return list(_slow)
+
+
+def reset_query_stats() -> None:
+    with _lock:
+        _stats.clear()
+        _slow.clear()
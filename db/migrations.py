@@ -0,0 +1,105 @@
+"""Versioned schema migrations.
+
+`Base.metadata.create_all` only creates missing tables, so databases created
+by older versions of Spent never pick up new indexes or schema tweaks. Each
+migration below upgrades a live database in place; the applied version is
+stored in SQLite's ``PRAGMA user_version`` header field.
+
+Migrations must be idempotent (``IF NOT EXISTS`` etc.): a fresh database gets
+most objects from `create_all` first and then runs every migration once.
+"""
+from typing import Callable, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from . import rollups
+
+
+# ========== MIGRATION STEPS ==========
+
+def _add_transaction_indexes(conn: Connection) -> None:
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_transactions_date_id "
+        "ON transactions (date, id)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_transactions_type_category_date "
+        "ON transactions (type, category_id, date, amount)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_transactions_recurring_id "
+        "ON transactions (recurring_id)"
+    ))
+    conn.execute(text("ANALYZE transactions"))
+
+
+def _add_monthly_rollups(conn: Connection) -> None:
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS monthly_rollups ("
+        "month VARCHAR(7) NOT NULL, type VARCHAR(20) NOT NULL, category_id INTEGER NOT NULL, "
+        "total FLOAT NOT NULL, tx_count INTEGER NOT NULL, "
+        "PRIMARY KEY (month, type, category_id))"
+    ))
+    rollups.install_triggers(conn)
+    rollups.rebuild(conn)
+
+
+def _unique_recurring_occurrences(conn: Connection) -> None:
+    # occurrences of deleted rules: detach them so a reused rule id can't collide
+    conn.execute(text(
+        "UPDATE transactions SET recurring_id = NULL WHERE recurring_id IS NOT NULL "
+        "AND recurring_id NOT IN (SELECT id FROM recurring_rules)"
+    ))
+    # older releases didn't detach on delete and SQLite reuses the highest
+    # rule id, so a "duplicate" may be another rule's real transaction: keep
+    # every row, detaching all but the oldest per (recurring_id, date) so the
+    # unique index can be built
+    conn.execute(text(
+        "UPDATE transactions SET recurring_id = NULL WHERE recurring_id IS NOT NULL AND id NOT IN ("
+        "SELECT min(id) FROM transactions WHERE recurring_id IS NOT NULL "
+        "GROUP BY recurring_id, date)"
+    ))
+    conn.execute(text("DROP INDEX IF EXISTS ix_transactions_recurring_id"))
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_transactions_recurring_date "
+        "ON transactions (recurring_id, date)"
+    ))
+
+
+# (version, description, step) — append only, never renumber.
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "indexes on transactions (date/id, type/category/date, recurring_id)", _add_transaction_indexes),
+    (2, "monthly_rollups table + maintenance triggers", _add_monthly_rollups),
+    (3, "unique (recurring_id, date) for generated occurrences", _unique_recurring_occurrences),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# ========== RUNNER ==========
+
+def get_schema_version(conn: Connection) -> int:
+    return int(conn.execute(text("PRAGMA user_version")).scalar_one() or 0)
+
+
+def _set_schema_version(conn: Connection, version: int) -> None:
+    # PRAGMA does not accept bound parameters
+    conn.execute(text(f"PRAGMA user_version = {int(version)}"))
+
+
+def run_migrations(engine: Engine) -> int:
+    """Apply all pending migrations in order. Returns how many were applied."""
+    applied = 0
+    with engine.connect() as conn:
+        current = get_schema_version(conn)
+
+    for version, _description, step in MIGRATIONS:
+        if version <= current:
+            continue
+        with engine.begin() as conn:
+            step(conn)
+            _set_schema_version(conn, version)
+        applied += 1
+
+    return applied
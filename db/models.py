@@ -1,5 +1,5 @@
 from sqlalchemy.orm import declarative_base, relationship
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text, Index
 
 Base = declarative_base()
 
@@ -32,6 +32,17 @@ class Transaction(Base):
 
     category = relationship("Category", back_populates="transactions")
 
+    # Kept in sync with db/migrations.py, which adds the same indexes to
+    # databases created before they existed.
+    __table_args__ = (
+        # newest-first listing: ORDER BY date DESC, id DESC
+        Index("ix_transactions_date_id", "date", "id"),
+        # budget sums / category reports; amount makes the index covering
+        Index("ix_transactions_type_category_date", "type", "category_id", "date", "amount"),
+        # one generated occurrence per rule and day (makes rule catch-up idempotent)
+        Index("ux_transactions_recurring_date", "recurring_id", "date", unique=True),
+    )
+
     def __repr__(self) -> str:
         return f"<Transaction {self.date} {self.amount} {self.type}>"
 
@@ -66,4 +77,14 @@ class RecurringRule(Base):
 
     every = Column(String, nullable=False)              # daily / weekly / monthly / custom-days
     interval = Column(Integer, default=1)               # 1 = every month, 2 = every 2 months
-    next_date = Column(String, nullable=False) 
\ No newline at end of file
+    next_date = Column(String, nullable=False) 
+
+class MonthlyRollup(Base):
+    """Per-month totals maintained by SQLite triggers (see db/rollups.py)."""
+    __tablename__ = "monthly_rollups"
+
+    month = Column(String(7), primary_key=True)        # "YYYY-MM"
+    type = Column(String(20), primary_key=True)        # income or expense
+    category_id = Column(Integer, primary_key=True)    # 0 = uncategorized
+    total = Column(Float, nullable=False, default=0.0)
+    tx_count = Column(Integer, nullable=False, default=0)
@@ -1,47 +1,262 @@
-from typing import List, Dict, Tuple, Optional
-from collections import defaultdict
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator, Callable, IO
+from collections import OrderedDict
 from datetime import date, datetime, timedelta
+import copy
+import functools
 import os
-import shutil
 import csv
+import gzip
 import json
+import sqlite3
+import tempfile
+import threading
+from contextlib import closing
 
-from sqlalchemy import create_engine, select, func
+from sqlalchemy import select, func, insert, and_, or_, literal, union_all
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
 from .models import Base, Transaction, Category, Budget, RecurringRule, Setting
+from .migrations import run_migrations
+from .aggregation import aggregate
+from . import rollups, pragmas, backup, snapshots, instrumentation
+from .connection import MEMORY, create_db_engine, resolve_db_path
+
+# Bound by configure_database(); re-bound when the app opens another database.
+engine: Optional[Engine] = None
+SessionLocal = sessionmaker(autoflush=False, autocommit=False)
+_db_path: Optional[str] = None
+
+# PRAGMA profile applied to every new connection (see db/pragmas.py)
+_db_profile = pragmas.profile_from_env() or pragmas.DEFAULT_PROFILE
+
+# SQL tracing (see db/instrumentation.py): SPENT_SQL_TRACE now, the stored
+# settings once init_db can read them
+instrumentation.configure_from_env()
+
+
+def configure_database(path: Optional[str] = None) -> str:
+    """Point the repository at the database at `path` (see db/connection.py
+    for the defaults; ``:memory:`` for a private in-memory DB) and return
+    the resolved path. The schema isn't touched: call `init_db` next, or use
+    `open_database`."""
+    global engine, _db_path
+    resolved = resolve_db_path(path)
+    old_engine = engine
+    engine = create_db_engine(resolved, lambda: _db_profile)
+    instrumentation.attach(engine)
+    SessionLocal.configure(bind=engine)
+    _db_path = resolved
+    if old_engine is not None:
+        old_engine.dispose()
+    invalidate_query_cache()
+    return resolved
+
+
+def get_db_path() -> str:
+    return _db_path
+
+
+def get_db_profile() -> str:
+    return _db_profile
+
+
+def set_db_profile(name: str, persist: bool = True) -> None:
+    """Switch the connection tuning profile. Pooled connections are dropped
+    so the next checkout opens a connection with the new PRAGMAs."""
+    global _db_profile
+    pragmas.validate_profile(name)
+    if persist:
+        set_setting("db_profile", name)
+    _db_profile = name
+    engine.dispose()
+
+
+def set_sql_trace(enabled: bool, slow_ms: Optional[float] = None, persist: bool = True) -> None:
+    """Turn SQL instrumentation on/off (and optionally set the slow-query
+    threshold in ms). With `persist` the choice is stored in the settings."""
+    if persist:
+        set_setting("sql_trace", "1" if enabled else "0")
+        if slow_ms is not None:
+            set_setting("slow_query_ms", str(slow_ms))
+    instrumentation.configure(enabled, slow_ms)
+
+
+def _apply_stored_sql_trace() -> None:
+    env_enabled, env_slow_ms = instrumentation.settings_from_env()
+    if env_enabled is not None:
+        return
+    try:
+        stored_ms = float(get_setting("slow_query_ms") or "")
+    except ValueError:
+        stored_ms = None
+    set_sql_trace(
+        get_setting("sql_trace") == "1",
+        env_slow_ms if env_slow_ms is not None else stored_ms,
+        persist=False,
+    )
+
+
+# ========== CHANGE NOTIFICATION ==========
+
+# Data domains a write can touch; listeners receive one call per domain.
+DOMAINS = ("transactions", "categories", "budgets", "recurring", "settings")
+
+# A row-level change: {"before": row or None, "after": row or None}, rows in
+# the `_tx_to_dict` format. Insert = no "before", delete = no "after".
+RowChange = Dict[str, Optional[Dict]]
+WriteListener = Callable[[str, Optional[List[RowChange]]], None]
+
+_write_listeners: List[WriteListener] = []
+
+
+def add_write_listener(listener: WriteListener) -> None:
+    """Call `listener(domain, changes)` after every committed write to that
+    domain. `changes` lists the affected transaction rows for single-row
+    transaction writes; it is None when the scope isn't known row by row
+    (bulk writes, other domains), meaning "reload". Listeners run on the
+    writing thread."""
+    if listener not in _write_listeners:
+        _write_listeners.append(listener)
+
+
+def remove_write_listener(listener: WriteListener) -> None:
+    if listener in _write_listeners:
+        _write_listeners.remove(listener)
+
+
+def _notify_write(*domains: str, changes: Optional[List[RowChange]] = None) -> None:
+    invalidate_query_cache()
+    for domain in domains:
+        domain_changes = changes if domain == "transactions" else None
+        for listener in list(_write_listeners):
+            listener(domain, domain_changes)
+
+
+# ========== QUERY CACHE ==========
+
+# Read functions decorated with @cached_query remember their results per
+# (function, arguments). Every entry is tagged with the data version it was
+# computed at; any write bumps the version, so stale entries are never served.
+QUERY_CACHE_SIZE = 256
+
+_data_version = 0
+_query_cache: "OrderedDict[Tuple, Tuple[int, object]]" = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_counters = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+def invalidate_query_cache() -> None:
+    """Bump the data version. Called by every repository write; call it
+    yourself after writing to the database behind the repository's back."""
+    global _data_version
+    with _cache_lock:
+        _data_version += 1
+        _query_cache.clear()
+        _cache_counters["invalidations"] += 1
+
+
+def cache_stats() -> Dict[str, float]:
+    with _cache_lock:
+        hits, misses = _cache_counters["hits"], _cache_counters["misses"]
+        return {
+            **_cache_counters,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "size": len(_query_cache),
+            "version": _data_version,
+        }
+
 
-DATABASE_URL = "sqlite:///spent.db"
+def reset_cache_stats() -> None:
+    with _cache_lock:
+        for name in _cache_counters:
+            _cache_counters[name] = 0
 
-engine = create_engine(DATABASE_URL, echo=False, future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+def cached_query(fn):
+    """Cache `fn`'s result per arguments until the next write. Callers get a
+    copy, so mutating a result never leaks into the cache or other callers."""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+        with _cache_lock:
+            version = _data_version
+            entry = _query_cache.get(key)
+            if entry is not None and entry[0] == version:
+                _query_cache.move_to_end(key)
+                _cache_counters["hits"] += 1
+                return copy.deepcopy(entry[1])
+            _cache_counters["misses"] += 1
+
+        result = fn(*args, **kwargs)
+
+        with _cache_lock:
+            # a write that landed while we were querying makes this result stale
+            if version == _data_version:
+                _query_cache[key] = (version, result)
+                _query_cache.move_to_end(key)
+                while len(_query_cache) > QUERY_CACHE_SIZE:
+                    _query_cache.popitem(last=False)
+        return copy.deepcopy(result)
+
+    wrapper.uncached = fn
+    return wrapper
+
+
+# Bind the default database (argument-less: SPENT_DB or ./spent.db). Engines
+# connect lazily, so nothing is opened until the first query.
+configure_database()
 
 
 # ========== DB INIT ==========
 
-def init_db() -> None:
-    Base.metadata.create_all(engine)
+DEFAULT_CATEGORIES = [
+    ("General", "expense"),
+    ("Food", "expense"),
+    ("Transport", "expense"),
+    ("Shopping", "expense"),
+    ("Salary", "income"),
+    ("Freelance", "income"),
+    ("Other", "income"),
+]
 
-    with SessionLocal() as session:
-        defaults = [
-            ("General", "expense"),
-            ("Food", "expense"),
-            ("Transport", "expense"),
-            ("Shopping", "expense"),
-            ("Salary", "income"),
-            ("Freelance", "income"),
-            ("Other", "income"),
-        ]
 
-        for name, type_ in defaults:
-            exists = session.execute(
-                select(Category).where(Category.name == name, Category.type == type_)
-            ).scalar_one_or_none()
+def open_database(path: str, apply_recurring: bool = True) -> str:
+    """Switch to another database while running: rebind, create/upgrade its
+    schema and tell every listener that all data changed."""
+    resolved = configure_database(path)
+    init_db(apply_recurring=apply_recurring)
+    _notify_write(*DOMAINS)
+    return resolved
 
-            if not exists:
-                session.add(Category(name=name, type=type_))
 
-        session.commit()
+def init_db(apply_recurring: bool = True) -> None:
+    """Create/upgrade the schema and seed default categories.
+
+    With `apply_recurring=False` the (potentially slow) recurring-rule
+    catch-up is left to the caller, e.g. a background worker at start-up.
+    """
+    Base.metadata.create_all(engine)
+    # upgrade databases created by older versions (indexes etc.)
+    run_migrations(engine)
+
+    # the stored profile applies unless SPENT_DB_PROFILE overrides it
+    stored = get_setting("db_profile")
+    if not pragmas.profile_from_env() and stored in pragmas.PROFILES and stored != _db_profile:
+        set_db_profile(stored, persist=False)
+    _apply_stored_sql_trace()
+
+    with SessionLocal() as session:
+        existing = set(session.execute(select(Category.name, Category.type)).all())
+        missing = [(name, type_) for name, type_ in DEFAULT_CATEGORIES if (name, type_) not in existing]
+        if missing:
+            session.add_all(Category(name=name, type=type_) for name, type_ in missing)
+            session.commit()
+            _notify_write("categories")
+
+    if not apply_recurring:
+        return
 
     # Apply any recurring rules that are due (generate transactions)
     try:
@@ -53,6 +268,7 @@ def init_db() -> None:
 
 # ========== CATEGORY HELPERS ==========
 
+@cached_query
 def get_categories(type_filter: Optional[str] = None) -> List[Dict]:
     with SessionLocal() as session:
         stmt = select(Category)
@@ -79,6 +295,7 @@ def create_category(name: str, type_: str) -> bool:
 
         session.add(Category(name=name, type=type_))
         session.commit()
+        _notify_write("categories")
         return True
 
 
@@ -99,6 +316,7 @@ def update_category(cat_id: int, new_name: str, new_type: Optional[str] = None)
                 cat.type = nt
 
         session.commit()
+        _notify_write("categories", "transactions")
         return True
 
 
@@ -114,12 +332,15 @@ def delete_category(cat_id: int) -> bool:
 
         session.delete(cat)
         session.commit()
+        _notify_write("categories", "transactions")
         return True
 
 
 # ========== TRANSACTIONS ==========
 
-def add_transaction(data: Dict) -> None:
+def add_transaction(data: Dict) -> Dict:
+    """Insert a transaction (creating its category if needed) and return the
+    new row."""
     with SessionLocal() as session:
         category = Category
         category = session.execute(
@@ -128,7 +349,8 @@ def add_transaction(data: Dict) -> None:
             )
         ).scalar_one_or_none()
 
-        if not category:
+        new_category = not category
+        if new_category:
             category = Category(name=data["category"], type=data["type"])
             session.add(category)
             session.flush()
@@ -143,8 +365,44 @@ def add_transaction(data: Dict) -> None:
             note=data.get("note", ""),
         )
         session.add(tx)
+        session.flush()
+        row = _tx_to_dict(tx, category)
         session.commit()
 
+    _notify_write(
+        "transactions", *(("categories",) if new_category else ()),
+        changes=[{"before": None, "after": row}],
+    )
+    return row
+
+
+def _tx_to_dict(tx: Transaction, cat: Optional[Category]) -> Dict:
+    return {
+        "id": tx.id,
+        "date": tx.date,
+        "amount": tx.amount,
+        "type": tx.type,
+        "category": cat.name if cat else "",
+        "payment_method": tx.payment_method or "",
+        "tags": tx.tags or "",
+        "note": tx.note or "",
+    }
+
+
+def _transaction_filters(date_from=None, date_to=None, category=None, type_=None) -> List:
+    """WHERE clauses shared by filter / page / count queries.
+    A category clause needs the Category join."""
+    clauses = []
+    if date_from:
+        clauses.append(Transaction.date >= date_from)
+    if date_to:
+        clauses.append(Transaction.date <= date_to)
+    if category and category.lower() != "all":
+        clauses.append(Category.name == category)
+    if type_ and type_.lower() != "all":
+        clauses.append(Transaction.type == type_.lower())
+    return clauses
+
 
 def list_transactions() -> List[Dict]:
     with SessionLocal() as session:
@@ -155,19 +413,7 @@ def list_transactions() -> List[Dict]:
         )
         rows = session.execute(stmt).all()
 
-        return [
-            {
-                "id": tx.id,
-                "date": tx.date,
-                "amount": tx.amount,
-                "type": tx.type,
-                "category": cat.name if cat else "",
-                "payment_method": tx.payment_method or "",
-                "tags": tx.tags or "",
-                "note": tx.note or "",
-            }
-            for tx, cat in rows
-        ]
+        return [_tx_to_dict(tx, cat) for tx, cat in rows]
 
 
 def filter_transactions(date_from=None, date_to=None, category=None, type_=None) -> List[Dict]:
@@ -175,112 +421,104 @@ def filter_transactions(date_from=None, date_to=None, category=None, type_=None)
         stmt = (
             select(Transaction, Category)
             .join(Category, Transaction.category_id == Category.id, isouter=True)
+            .where(*_transaction_filters(date_from, date_to, category, type_))
         )
 
-        if date_from:
-            stmt = stmt.where(Transaction.date >= date_from)
-        if date_to:
-            stmt = stmt.where(Transaction.date <= date_to)
-        if category and category.lower() != "all":
-            stmt = stmt.where(Category.name == category)
-        if type_ and type_.lower() != "all":
-            stmt = stmt.where(Transaction.type == type_.lower())
+        rows = session.execute(stmt).all()
+        return [_tx_to_dict(tx, cat) for tx, cat in rows]
+
+
+def list_transactions_page(
+    limit: int = 100,
+    after: Optional[Tuple[str, int]] = None,
+    date_from=None,
+    date_to=None,
+    category=None,
+    type_=None,
+) -> List[Dict]:
+    """One page of transactions ordered by date DESC, id DESC.
+
+    `after` is the (date, id) of the last row of the previous page (keyset
+    pagination), so every page costs the same regardless of how deep it is.
+    Filters work like `filter_transactions`.
+    """
+    with SessionLocal() as session:
+        stmt = (
+            select(Transaction, Category)
+            .join(Category, Transaction.category_id == Category.id, isouter=True)
+            .where(*_transaction_filters(date_from, date_to, category, type_))
+        )
+        if after is not None:
+            after_date, after_id = after
+            stmt = stmt.where(
+                or_(
+                    Transaction.date < after_date,
+                    and_(Transaction.date == after_date, Transaction.id < after_id),
+                )
+            )
+        stmt = stmt.order_by(Transaction.date.desc(), Transaction.id.desc()).limit(limit)
 
         rows = session.execute(stmt).all()
-        return [
-            {
-                "id": tx.id,
-                "date": tx.date,
-                "amount": tx.amount,
-                "type": tx.type,
-                "category": cat.name if cat else "",
-                "payment_method": tx.payment_method or "",
-                "tags": tx.tags or "",
-                "note": tx.note or "",
-            }
-            for tx, cat in rows
-        ]
+        return [_tx_to_dict(tx, cat) for tx, cat in rows]
 
 
-def get_totals() -> Tuple[float, float, float]:
+@cached_query
+def count_transactions(date_from=None, date_to=None, category=None, type_=None) -> int:
     with SessionLocal() as session:
-        income_stmt = select(func.coalesce(func.sum(Transaction.amount), 0.0)).where(
-            Transaction.type == "income"
-        )
-        income = session.execute(income_stmt).scalar_one() or 0.0
+        stmt = select(func.count(Transaction.id))
+        if category and category.lower() != "all":
+            stmt = stmt.join(Category, Transaction.category_id == Category.id)
+        stmt = stmt.where(*_transaction_filters(date_from, date_to, category, type_))
+        return int(session.execute(stmt).scalar_one())
 
-        expense_stmt = select(func.coalesce(func.sum(Transaction.amount), 0.0)).where(
-            Transaction.type == "expense"
-        )
-        expense = session.execute(expense_stmt).scalar_one() or 0.0
 
-        balance = income - expense
-        return float(income), float(expense), float(balance)
+@cached_query
+def get_totals() -> Tuple[float, float, float]:
+    with SessionLocal() as session:
+        by_type = {r["type"]: float(r["total"]) for r in aggregate(session, ["type"])}
+
+    income = by_type.get("income", 0.0)
+    expense = by_type.get("expense", 0.0)
+    balance = income - expense
+    return float(income), float(expense), float(balance)
 
 
 # ========== REPORTS ==========
 
+@cached_query
 def get_expense_by_category_summary() -> Dict[str, float]:
     with SessionLocal() as session:
-        stmt = (
-            select(Transaction, Category)
-            .join(Category, Transaction.category_id == Category.id, isouter=True)
-            .where(Transaction.type == "expense")
-        )
-        rows = session.execute(stmt).all()
-        totals: Dict[str, float] = defaultdict(float)
-
-        for tx, cat in rows:
-            name = cat.name if cat else "Uncategorized"
-            totals[name] += tx.amount
-
-        return dict(totals)
+        rows = aggregate(session, ["category"], type_="expense")
+        return {r["category"]: float(r["total"]) for r in rows}
 
 
+@cached_query
 def get_monthly_income_expense_summary() -> List[Dict[str, float]]:
     with SessionLocal() as session:
-        txs = session.execute(select(Transaction)).scalars().all()
-        income_map = defaultdict(float)
-        expense_map = defaultdict(float)
+        rows = aggregate(session, ["month", "type"])
 
-        for tx in txs:
-            if not tx.date:
-                continue
-            month = tx.date[:7]
-            if tx.type == "income":
-                income_map[month] += tx.amount
-            elif tx.type == "expense":
-                expense_map[month] += tx.amount
+    by_month: Dict[str, Dict[str, float]] = {}
+    for r in rows:
+        if not r["month"] or r["type"] not in ("income", "expense"):
+            continue
+        entry = by_month.setdefault(r["month"], {"month": r["month"], "income": 0.0, "expense": 0.0})
+        entry[r["type"]] = float(r["total"])
 
-        months = sorted(set(list(income_map.keys()) + list(expense_map.keys())))
-        return [
-            {
-                "month": m,
-                "income": float(income_map.get(m, 0.0)),
-                "expense": float(expense_map.get(m, 0.0)),
-            }
-            for m in months
-        ]
+    return [by_month[m] for m in sorted(by_month)]
 
 
+@cached_query
 def get_balance_timeseries() -> List[Dict[str, float]]:
     with SessionLocal() as session:
-        txs = session.execute(
-            select(Transaction).order_by(Transaction.date.asc(), Transaction.id.asc())
-        ).scalars().all()
-
-        balance = 0.0
-        points = []
+        rows = aggregate(session, ["date"], signed=True, cumulative=True)
+        return [{"date": r["date"], "balance": float(r["running_total"])} for r in rows]
 
-        for tx in txs:
-            balance = balance + tx.amount if tx.type == "income" else balance - tx.amount
-            points.append({"date": tx.date, "balance": float(balance)})
 
-        compressed = {}
-        for p in points:
-            compressed[p["date"]] = p["balance"]
-
-        return [{"date": d, "balance": compressed[d]} for d in sorted(compressed.keys())]
+def rebuild_monthly_rollups() -> None:
+    """Recompute the monthly_rollups table from all transactions."""
+    with engine.begin() as conn:
+        rollups.rebuild(conn)
+    _notify_write("transactions")
 
 
 # ========== BUDGETS (CORRECTED) ==========
@@ -302,6 +540,7 @@ def _get_cycle_window(cycle_day: int, ref_date: Optional[date] = None) -> Tuple[
     return start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
 
 
+@cached_query
 def get_budgets() -> List[Dict]:
     with SessionLocal() as session:
         stmt = (
@@ -337,6 +576,7 @@ def create_budget(category_id: int, amount: float, cycle_day: int) -> bool:
         b = Budget(category_id=category_id, amount=amount, cycle_day=cycle_day)
         session.add(b)
         session.commit()
+        _notify_write("budgets")
         return True
 
 
@@ -350,6 +590,7 @@ def update_budget(budget_id: int, category_id: int, amount: float, cycle_day: in
         b.amount = amount
         b.cycle_day = cycle_day
         session.commit()
+        _notify_write("budgets")
         return True
 
 
@@ -360,52 +601,89 @@ def delete_budget(budget_id: int) -> bool:
             return False
         session.delete(b)
         session.commit()
+        _notify_write("budgets")
         return True
 
 
+def _cycle_windows_cte(ref_date: date):
+    """(day, start_date, end_date) for every possible cycle day 1–28."""
+    selects = []
+    for d in range(1, 29):
+        start_str, end_str = _get_cycle_window(d, ref_date)
+        selects.append(
+            select(
+                literal(d).label("day"),
+                literal(start_str).label("start_date"),
+                literal(end_str).label("end_date"),
+            )
+        )
+    return union_all(*selects).cte("cycle_windows")
+
+
 def get_budgets_with_status(ref_date: Optional[date] = None) -> List[Dict]:
-    if ref_date is None:
-        ref_date = date.today()
+    # resolve "today" before the cache lookup so results don't outlive the day
+    return _budgets_with_status(ref_date or date.today())
+
+
+@cached_query
+def _budgets_with_status(ref_date: date) -> List[Dict]:
+    windows = _cycle_windows_cte(ref_date)
+    # same clamping as _get_cycle_window
+    cycle_day = func.max(func.min(Budget.cycle_day, 28), 1)
+    spent_sum = func.coalesce(func.sum(Transaction.amount), 0.0)
+
+    # one statement: budgets x their cycle window, expense spend summed per budget
+    stmt = (
+        select(
+            Budget.id,
+            Budget.category_id,
+            Category.name,
+            Category.type,
+            Budget.amount,
+            Budget.cycle_day,
+            spent_sum.label("spent"),
+        )
+        .join(Category, Budget.category_id == Category.id)
+        .join(windows, windows.c.day == cycle_day)
+        .join(
+            Transaction,
+            and_(
+                Transaction.type == "expense",
+                Transaction.category_id == Budget.category_id,
+                Transaction.date >= windows.c.start_date,
+                Transaction.date < windows.c.end_date,
+            ),
+            isouter=True,
+        )
+        .group_by(Budget.id, Budget.category_id, Category.name, Category.type, Budget.amount, Budget.cycle_day)
+        .order_by(Budget.id)
+    )
 
     with SessionLocal() as session:
-        stmt = select(Budget, Category).join(Category, Budget.category_id == Category.id)
         rows = session.execute(stmt).all()
 
-        result: List[Dict] = []
-        for b, cat in rows:
-            start_str, end_str = _get_cycle_window(b.cycle_day, ref_date)
-
-            spent = (
-                session.execute(
-                    select(func.coalesce(func.sum(Transaction.amount), 0.0)).where(
-                        Transaction.type == "expense",
-                        Transaction.category_id == b.category_id,
-                        Transaction.date >= start_str,
-                        Transaction.date < end_str,
-                    )
-                ).scalar_one()
-                or 0.0
-            )
-
-            remaining = float(b.amount) - float(spent)
-            percent = float(spent) / float(b.amount) * 100.0 if b.amount else 0.0
+    result: List[Dict] = []
+    for b_id, category_id, cat_name, cat_type, amount, b_cycle_day, spent in rows:
+        spent = spent or 0.0
+        remaining = float(amount) - float(spent)
+        percent = float(spent) / float(amount) * 100.0 if amount else 0.0
 
-            result.append(
-                {
-                    "id": b.id,
-                    "category_id": b.category_id,
-                    "category_name": cat.name,
-                    "type": cat.type,
-                    "amount": float(b.amount),
-                    "cycle_day": int(b.cycle_day),
-                    "spent": float(spent),
-                    "remaining": float(remaining),
-                    "percent": float(percent),
-                    "overspent": remaining < 0,
-                }
-            )
+        result.append(
+            {
+                "id": b_id,
+                "category_id": category_id,
+                "category_name": cat_name,
+                "type": cat_type,
+                "amount": float(amount),
+                "cycle_day": int(b_cycle_day),
+                "spent": float(spent),
+                "remaining": float(remaining),
+                "percent": float(percent),
+                "overspent": remaining < 0,
+            }
+        )
 
-        return result
+    return result
 
 
 def any_budget_overspent(ref_date: Optional[date] = None) -> bool:
@@ -433,11 +711,15 @@ def get_transaction(tx_id: int) -> Optional[Dict]:
         }
 
 
-def update_transaction(tx_id: int, data: Dict) -> bool:
+def update_transaction(tx_id: int, data: Dict) -> Optional[Dict]:
+    """Update a transaction; returns the updated row, or None if it doesn't exist."""
+    domains = ["transactions"]
     with SessionLocal() as session:
         tx = session.get(Transaction, tx_id)
         if not tx:
-            return False
+            return None
+        cat = session.get(Category, tx.category_id) if tx.category_id is not None else None
+        before = _tx_to_dict(tx, cat)
 
         tx.date = data.get("date", tx.date)
         tx.amount = data.get("amount", tx.amount)
@@ -450,6 +732,7 @@ def update_transaction(tx_id: int, data: Dict) -> bool:
                 select(Category).where(Category.name == category_name)
             ).scalar_one_or_none()
             if not cat:
+                domains.append("categories")
                 cat = Category(name=category_name, type=data.get("type", tx.type))
                 session.add(cat)
                 session.flush()
@@ -458,90 +741,338 @@ def update_transaction(tx_id: int, data: Dict) -> bool:
         tx.payment_method = data.get("payment_method", tx.payment_method)
         tx.tags = data.get("tags", tx.tags)
         tx.note = data.get("note", tx.note)
+        session.flush()
+        after = _tx_to_dict(tx, cat)
         session.commit()
-        return True
+        _notify_write(*domains, changes=[{"before": before, "after": after}])
+        return after
 
 
-def delete_transaction(tx_id: int) -> bool:
+def delete_transaction(tx_id: int) -> Optional[Dict]:
+    """Delete a transaction; returns the deleted row, or None if it didn't exist."""
     with SessionLocal() as session:
         tx = session.get(Transaction, tx_id)
         if not tx:
-            return False
+            return None
+        cat = session.get(Category, tx.category_id) if tx.category_id is not None else None
+        before = _tx_to_dict(tx, cat)
         session.delete(tx)
         session.commit()
-        return True
+        _notify_write("transactions", changes=[{"before": before, "after": None}])
+        return before
 
 
 # ========== IMPORT / EXPORT / BACKUP ==========
 
-def export_transactions_csv(path: str) -> None:
-    rows = list_transactions()
-    fieldnames = ["id", "date", "amount", "type", "category", "payment_method", "tags", "note"]
-    with open(path, "w", newline='', encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for r in rows:
-            writer.writerow({k: r.get(k, "") for k in fieldnames})
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_FIELDS = ["id", "date", "amount", "type", "category", "payment_method", "tags", "note"]
+
+
+def _open_text(path: str, mode: str, compress: bool = False) -> IO[str]:
+    """Open a text file, transparently gzip'd when asked or named *.gz."""
+    if compress or path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    return open(path, mode, newline="", encoding="utf-8")
+
+
+def iter_transactions(chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Dict]:
+    """Yield every transaction newest-first, fetching `chunk_size` rows at a
+    time from the cursor instead of materialising the whole table."""
+    stmt = (
+        select(
+            Transaction.id,
+            Transaction.date,
+            Transaction.amount,
+            Transaction.type,
+            Category.name,
+            Transaction.payment_method,
+            Transaction.tags,
+            Transaction.note,
+        )
+        .join(Category, Transaction.category_id == Category.id, isouter=True)
+        .order_by(Transaction.date.desc(), Transaction.id.desc())
+        .execution_options(yield_per=chunk_size)
+    )
+    with SessionLocal() as session:
+        for tx_id, date_, amount, type_, cat_name, payment, tags, note in session.execute(stmt):
+            yield {
+                "id": tx_id,
+                "date": date_,
+                "amount": amount,
+                "type": type_,
+                "category": cat_name or "",
+                "payment_method": payment or "",
+                "tags": tags or "",
+                "note": note or "",
+            }
 
 
-def import_transactions_csv(path: str) -> int:
+def export_transactions_csv(path: str, compress: bool = False, chunk_size: int = EXPORT_CHUNK_SIZE) -> None:
+    with _open_text(path, "w", compress) as f:
+        writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+        for r in iter_transactions(chunk_size):
+            writer.writerow(r)
+
+
+def export_transactions_json(path: str, compress: bool = False, chunk_size: int = EXPORT_CHUNK_SIZE) -> None:
+    """Write a JSON array, one object at a time (same layout as json.dump indent=2)."""
+    with _open_text(path, "w", compress) as f:
+        f.write("[")
+        first = True
+        for r in iter_transactions(chunk_size):
+            f.write("\n  " if first else ",\n  ")
+            f.write(json.dumps(r, ensure_ascii=False, indent=2).replace("\n", "\n  "))
+            first = False
+        f.write("]" if first else "\n]")
+
+
+def export_transactions_ndjson(path: str, compress: bool = False, chunk_size: int = EXPORT_CHUNK_SIZE) -> None:
+    """Write one JSON object per line (newline-delimited JSON)."""
+    with _open_text(path, "w", compress) as f:
+        for r in iter_transactions(chunk_size):
+            f.write(json.dumps(r, ensure_ascii=False))
+            f.write("\n")
+
+
+IMPORT_BATCH_SIZE = 1000
+
+
+def _csv_row_to_data(row: Dict) -> Dict:
+    return {
+        "date": row.get("date") or datetime.today().strftime("%Y-%m-%d"),
+        "amount": float(row.get("amount", 0)),
+        "type": row.get("type", "expense"),
+        "category": row.get("category", ""),
+        "payment_method": row.get("payment_method", ""),
+        "tags": row.get("tags", ""),
+        "note": row.get("note", ""),
+    }
+
+
+def import_transactions(
+    rows: Iterable[Dict],
+    batch_size: int = IMPORT_BATCH_SIZE,
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """Bulk-insert transaction dicts (same shape as `add_transaction`).
+
+    Rows are consumed lazily and inserted in executemany batches inside a
+    single DB transaction; categories are resolved from a map built once.
+    Invalid rows are skipped. `progress(imported_so_far)` is called after
+    every batch. Returns the number of rows imported.
+    """
     added = 0
-    with open(path, newline='', encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
+    with SessionLocal() as session:
+        cat_ids = {
+            (c.name, c.type): c.id
+            for c in session.execute(select(Category)).scalars()
+        }
+
+        batch: List[Dict] = []
+
+        def flush() -> None:
+            nonlocal added
+            if not batch:
+                return
+            session.execute(insert(Transaction), batch)
+            added += len(batch)
+            batch.clear()
+            if progress:
+                progress(added)
+
+        for data in rows:
             try:
-                data = {
-                    "date": row.get("date") or datetime.today().strftime("%Y-%m-%d"),
-                    "amount": float(row.get("amount", 0)),
-                    "type": row.get("type", "expense"),
-                    "category": row.get("category", ""),
-                    "payment_method": row.get("payment_method", ""),
-                    "tags": row.get("tags", ""),
-                    "note": row.get("note", ""),
+                key = (data["category"], data["type"])
+                if data["date"] is None or None in key:
+                    raise ValueError("missing required field")  # NOT NULL columns
+                values = {
+                    "date": data["date"],
+                    "amount": float(data["amount"]),
+                    "type": data["type"],
+                    "payment_method": data.get("payment_method", ""),
+                    "tags": data.get("tags", ""),
+                    "note": data.get("note", ""),
                 }
-                add_transaction(data)
-                added += 1
+                category_id = cat_ids.get(key)
             except Exception:
                 continue
+
+            if category_id is None:
+                category = Category(name=key[0], type=key[1])
+                session.add(category)
+                session.flush()
+                category_id = cat_ids[key] = category.id
+            values["category_id"] = category_id
+
+            batch.append(values)
+            if len(batch) >= batch_size:
+                flush()
+
+        flush()
+        session.commit()
+
+    if added:
+        _notify_write("transactions", "categories")
     return added
 
 
-def export_transactions_json(path: str) -> None:
-    rows = list_transactions()
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(rows, f, ensure_ascii=False, indent=2)
+def _iter_csv_rows(reader) -> Iterable[Dict]:
+    for row in reader:
+        try:
+            yield _csv_row_to_data(row)
+        except Exception:
+            continue
 
 
-def import_transactions_json(path: str) -> int:
-    added = 0
-    with open(path, encoding="utf-8") as f:
+def import_transactions_csv(path: str, progress: Optional[Callable[[int], None]] = None) -> int:
+    with _open_text(path, "r") as f:
+        reader = csv.DictReader(f)
+        return import_transactions(_iter_csv_rows(reader), progress=progress)
+
+
+def import_transactions_json(path: str, progress: Optional[Callable[[int], None]] = None) -> int:
+    with _open_text(path, "r") as f:
         data = json.load(f)
-        for row in data:
-            try:
-                add_transaction(row)
-                added += 1
-            except Exception:
-                continue
-    return added
+    return import_transactions(data, progress=progress)
+
 
+def _iter_ndjson_rows(f) -> Iterable[Dict]:
+    for line in f:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            continue
 
-def backup_db(backup_path: str) -> bool:
+
+def import_transactions_ndjson(path: str, progress: Optional[Callable[[int], None]] = None) -> int:
+    with _open_text(path, "r") as f:
+        return import_transactions(_iter_ndjson_rows(f), progress=progress)
+
+
+def backup_db(
+    backup_path: str,
+    compress: bool = False,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> bool:
+    """Online backup of the active database (see db/backup.py): consistent
+    while the app keeps writing, integrity-checked, optionally gzip'd.
+    `progress(done_pages, total_pages)` is called as pages are copied."""
     try:
-        src = os.path.abspath("spent.db")
-        shutil.copy2(src, backup_path)
+        raw = engine.raw_connection()
+        try:
+            backup.backup_database(raw.driver_connection, backup_path, compress=compress, progress=progress)
+        finally:
+            raw.close()
         return True
     except Exception:
         return False
 
 
 def restore_db(backup_path: str) -> bool:
+    """Replace the active database with a backup (plain or .gz) while the app
+    keeps running: the backup is validated first, then the pool is closed,
+    the file is swapped in with one rename, the engine is rebuilt, older
+    schemas are migrated and every listener is told that all data changed."""
     try:
-        dst = os.path.abspath("spent.db")
-        shutil.copy2(backup_path, dst)
-        return True
+        if _db_path == MEMORY:
+            staged = backup.stage_restore(backup_path)
+            try:
+                with closing(sqlite3.connect(staged)) as src:
+                    raw = engine.raw_connection()
+                    try:
+                        src.backup(raw.driver_connection)
+                    finally:
+                        raw.close()
+            finally:
+                os.remove(staged)
+            invalidate_query_cache()
+        else:
+            staged = backup.stage_restore(backup_path, os.path.dirname(_db_path))
+            try:
+                # close every pooled connection (the last one checkpoints the
+                # WAL) and drop what's left of it: it belongs to the old file
+                engine.dispose()
+                os.replace(staged, _db_path)
+            except BaseException:
+                os.remove(staged)
+                raise
+            for suffix in ("-wal", "-shm"):
+                if os.path.exists(_db_path + suffix):
+                    os.remove(_db_path + suffix)
+            configure_database(_db_path)
+
+        init_db(apply_recurring=False)
     except Exception:
         return False
 
+    _notify_write(*DOMAINS)
+    return True
+
+
+def default_snapshot_dir() -> str:
+    if _db_path == MEMORY:
+        raise ValueError("in-memory databases have no default snapshot directory")
+    return _db_path + ".snapshots"
+
+
+def snapshot_db(store_dir: Optional[str] = None, progress: Optional[Callable[[int, int], None]] = None) -> Dict:
+    """Incremental snapshot of the active database (see db/snapshots.py).
+    Returns the manifest with ``new_chunks`` / ``new_bytes`` written."""
+    store_dir = store_dir or default_snapshot_dir()
+    raw = engine.raw_connection()
+    try:
+        return snapshots.create_snapshot(raw.driver_connection, store_dir, progress=progress)
+    finally:
+        raw.close()
+
+
+def list_db_snapshots(store_dir: Optional[str] = None) -> List[Dict]:
+    return snapshots.list_snapshots(store_dir or default_snapshot_dir())
+
+
+def restore_db_snapshot(snapshot_id: str, store_dir: Optional[str] = None) -> bool:
+    """Reassemble a snapshot and restore it like `restore_db`."""
+    store_dir = store_dir or default_snapshot_dir()
+    fd, path = tempfile.mkstemp(prefix=".snapshot-restore-", suffix=".db", dir=store_dir)
+    os.close(fd)
+    try:
+        snapshots.restore_snapshot(store_dir, snapshot_id, path)
+        return restore_db(path)
+    except Exception:
+        return False
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def prune_db_snapshots(keep_last: int = 7, keep_daily: int = 30, store_dir: Optional[str] = None) -> Dict[str, int]:
+    return snapshots.prune_snapshots(store_dir or default_snapshot_dir(), keep_last, keep_daily)
+
+
+# ========== DIAGNOSTICS ==========
+
+def get_db_stats() -> Dict:
+    """Size of the active database (main file and WAL) and the row count of
+    every table, for the diagnostics page."""
+    with engine.connect() as conn:
+        page_size = conn.exec_driver_sql("PRAGMA page_size").scalar()
+        page_count = conn.exec_driver_sql("PRAGMA page_count").scalar()
+        tables = {
+            table.name: conn.execute(select(func.count()).select_from(table)).scalar_one()
+            for table in Base.metadata.sorted_tables
+        }
+    wal_path = f"{_db_path}-wal"
+    return {
+        "path": _db_path,
+        "profile": _db_profile,
+        "size_bytes": page_size * page_count,
+        "wal_bytes": os.path.getsize(wal_path) if _db_path != MEMORY and os.path.exists(wal_path) else 0,
+        "tables": tables,
+    }
+
 
 # ========== SETTINGS ==========
 
@@ -554,8 +1085,10 @@ def set_setting(key: str, value: str) -> None:
         else:
             s.value = value
         session.commit()
+    _notify_write("settings")
 
 
+@cached_query
 def get_setting(key: str, default: Optional[str] = None) -> Optional[str]:
     with SessionLocal() as session:
         s = session.get(Setting, key)
@@ -573,7 +1106,8 @@ def create_recurring_rule(data: Dict) -> int:
             cat = session.execute(
                 select(Category).where(Category.name == data["category"])
             ).scalar_one_or_none()
-        if not cat and data.get("category"):
+        created_category = not cat and bool(data.get("category"))
+        if created_category:
             cat = Category(name=data["category"], type=data.get("type", "expense"))
             session.add(cat)
             session.flush()
@@ -591,9 +1125,11 @@ def create_recurring_rule(data: Dict) -> int:
         )
         session.add(rr)
         session.commit()
+        _notify_write("recurring", *(("categories",) if created_category else ()))
         return rr.id
 
 
+@cached_query
 def list_recurring_rules() -> List[Dict]:
     with SessionLocal() as session:
         rows = session.execute(select(RecurringRule)).scalars().all()
@@ -622,64 +1158,113 @@ def delete_recurring_rule(rule_id: int) -> bool:
         r = session.get(RecurringRule, rule_id)
         if not r:
             return False
+        # keep generated transactions but detach them: SQLite may hand this
+        # id to the next rule, whose occurrences would then collide with
+        # these on the unique (recurring_id, date) index
+        session.query(Transaction).filter(
+            Transaction.recurring_id == rule_id
+        ).update({"recurring_id": None})
         session.delete(r)
         session.commit()
+        _notify_write("recurring")
         return True
 
 
-def _advance_next_date(current: str, every: str, interval: int) -> str:
+def _next_occurrence(d: date, every: str, interval: int) -> date:
+    if every in ("weekly", "week"):
+        return d + timedelta(weeks=interval)
+    if every in ("yearly", "year"):
+        # naive year add
+        return date(d.year + interval, d.month, min(d.day, 28))
+
+    # default monthly
+    month = d.month - 1 + interval
+    year = d.year + month // 12
+    month = month % 12 + 1
+    day = min(d.day, 28)
+    return date(year, month, day)
+
+
+def _parse_day(value: str) -> date:
     try:
-        d = datetime.strptime(current, "%Y-%m-%d").date()
+        return datetime.strptime(value, "%Y-%m-%d").date()
     except Exception:
-        d = date.today()
+        return date.today()
+
+
+def _advance_next_date(current: str, every: str, interval: int) -> str:
+    return _next_occurrence(_parse_day(current), every, interval).strftime("%Y-%m-%d")
 
-    if every in ("weekly", "week"):
-        nd = d + timedelta(weeks=interval)
-    elif every in ("yearly", "year"):
-        # naive year add
-        nd = date(d.year + interval, d.month, min(d.day, 28))
-    else:
-        # default monthly
-        month = d.month - 1 + interval
-        year = d.year + month // 12
-        month = month % 12 + 1
-        day = min(d.day, 28)
-        nd = date(year, month, day)
 
-    return nd.strftime("%Y-%m-%d")
+def _due_occurrences(next_date: str, every: str, interval: int, up_to: str) -> Tuple[List[str], str]:
+    """All occurrence dates from `next_date` through `up_to` (inclusive),
+    computed in one pass, plus the rule's new next_date."""
+    dates: List[str] = []
+    if next_date > up_to:
+        return dates, next_date
+
+    # first occurrence keeps the stored string as-is (it may not parse)
+    dates.append(next_date)
+    d = _next_occurrence(_parse_day(next_date), every, interval)
+    current = d.isoformat()
+    while current <= up_to:
+        dates.append(current)
+        d = _next_occurrence(d, every, interval)
+        current = d.isoformat()
+
+    return dates, current
+
+
+RECURRING_INSERT_BATCH = 1000
 
 
 def apply_recurring_rules(up_to_date: Optional[str] = None) -> int:
     """Generate due transactions for recurring rules up to `up_to_date` (YYYY-MM-DD).
-    Returns number of transactions created."""
+    Returns number of transactions created.
+
+    Occurrences are bulk-inserted with INSERT OR IGNORE against the unique
+    (recurring_id, date) index, so re-running after a crash or on a database
+    whose next_date lags behind never creates duplicates."""
     created = 0
     if up_to_date is None:
         up_to_date = datetime.today().strftime("%Y-%m-%d")
 
+    insert_ignore = insert(Transaction).prefix_with("OR IGNORE")
+
     with SessionLocal() as session:
         rules = session.execute(select(RecurringRule)).scalars().all()
+        pending: List[Dict] = []
+
+        def flush() -> None:
+            nonlocal created
+            if pending:
+                created += session.connection().execute(insert_ignore, pending).rowcount
+                pending.clear()
+
         for r in rules:
-            # generate while next_date <= up_to_date
-            while r.next_date <= up_to_date:
-                # create transaction
-                tx = Transaction(
-                    date=r.next_date,
-                    amount=r.amount,
-                    type=r.transaction_type,
-                    category_id=r.category_id,
-                    payment_method=r.payment_method or "",
-                    tags=r.tags or "",
-                    note=r.note or "",
-                    recurring_id=r.id,
+            interval = max(int(r.interval or 1), 1)
+            dates, r.next_date = _due_occurrences(r.next_date, r.every, interval, up_to_date)
+            for d in dates:
+                pending.append(
+                    {
+                        "date": d,
+                        "amount": r.amount,
+                        "type": r.transaction_type,
+                        "category_id": r.category_id,
+                        "payment_method": r.payment_method or "",
+                        "tags": r.tags or "",
+                        "note": r.note or "",
+                        "recurring_id": r.id,
+                    }
                 )
-                session.add(tx)
-                created += 1
-
-                # advance rule
-                r.next_date = _advance_next_date(r.next_date, r.every, int(r.interval or 1))
+                if len(pending) >= RECURRING_INSERT_BATCH:
+                    flush()
 
+        flush()
         session.commit()
 
+    if created:
+        _notify_write("transactions", "recurring")
     return created
 
 
@@ -697,6 +1282,8 @@ def wipe_all_data() -> bool:
             # delete all recurring rules
             session.execute(delete(RecurringRule))
             session.commit()
-        return True
     except Exception as e:
         return False
+
+    _notify_write("transactions", "budgets", "recurring")
+    return True
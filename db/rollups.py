@@ -0,0 +1,84 @@
+"""Monthly rollups kept up to date by SQLite triggers.
+
+``monthly_rollups`` holds one row per (month, type, category_id) with the sum
+and count of matching transactions. Triggers on ``transactions`` adjust it on
+every INSERT / UPDATE / DELETE, so every write path — ORM, bulk Core inserts,
+recurring rules, imports, wipes — keeps it consistent without repository
+hooks. Reports read a few hundred rollup rows instead of the full history.
+
+Rebuild an existing database's rollups from scratch with::
+
+    python -m db.rollups
+"""
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+_ADD = """
+    INSERT INTO monthly_rollups (month, type, category_id, total, tx_count)
+    VALUES (substr(NEW.date, 1, 7), NEW.type, coalesce(NEW.category_id, 0), NEW.amount, 1)
+    ON CONFLICT (month, type, category_id)
+    DO UPDATE SET total = total + excluded.total, tx_count = tx_count + 1;
+"""
+
+_REMOVE = """
+    UPDATE monthly_rollups
+    SET total = total - OLD.amount, tx_count = tx_count - 1
+    WHERE month = substr(OLD.date, 1, 7) AND type = OLD.type
+      AND category_id = coalesce(OLD.category_id, 0);
+    DELETE FROM monthly_rollups
+    WHERE month = substr(OLD.date, 1, 7) AND type = OLD.type
+      AND category_id = coalesce(OLD.category_id, 0) AND tx_count <= 0;
+"""
+
+TRIGGERS = {
+    "trg_rollups_tx_insert": f"AFTER INSERT ON transactions BEGIN {_ADD} END",
+    "trg_rollups_tx_delete": f"AFTER DELETE ON transactions BEGIN {_REMOVE} END",
+    "trg_rollups_tx_update": (
+        "AFTER UPDATE OF date, amount, type, category_id ON transactions "
+        f"BEGIN {_REMOVE} {_ADD} END"
+    ),
+}
+
+
+def install_triggers(conn: Connection) -> None:
+    for name, body in TRIGGERS.items():
+        conn.execute(text(f"CREATE TRIGGER IF NOT EXISTS {name} {body}"))
+
+
+def drop_triggers(conn: Connection) -> None:
+    for name in TRIGGERS:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+
+
+def rebuild(conn: Connection) -> None:
+    """Recompute every rollup row from ``transactions``."""
+    conn.execute(text("DELETE FROM monthly_rollups"))
+    conn.execute(text(
+        "INSERT INTO monthly_rollups (month, type, category_id, total, tx_count) "
+        "SELECT substr(date, 1, 7), type, coalesce(category_id, 0), sum(amount), count(*) "
+        "FROM transactions GROUP BY 1, 2, 3"
+    ))
+
+
+@contextmanager
+def suspended_triggers(conn: Connection) -> Iterator[Connection]:
+    """Drop the triggers for a large bulk load, then reinstall and rebuild
+    once at the end (much cheaper than one upsert per inserted row)."""
+    drop_triggers(conn)
+    try:
+        yield conn
+    finally:
+        install_triggers(conn)
+        rebuild(conn)
+
+
+if __name__ == "__main__":
+    from .repository import init_db, rebuild_monthly_rollups
+
+    init_db()
+    rebuild_monthly_rollups()
+    print("monthly_rollups rebuilt")
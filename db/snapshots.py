@@ -0,0 +1,245 @@
+"""Incremental, deduplicated database snapshots.
+
+A snapshot store is a directory::
+
+    chunks/<2 hex>/<sha256>     zlib-compressed, content-addressed blobs
+    manifests/<snapshot id>.json
+
+Taking a snapshot makes a consistent online copy of the database (see
+db/backup.py), cuts it into `CHUNK_SIZE` pieces (one default SQLite page)
+and stores each piece under the hash of its content, once. The ordered list
+of chunk hashes is itself cut into index blocks of `INDEX_FANOUT` hashes,
+stored the same way, and the manifest only lists the index blocks. The
+backup API copies page for page, so a snapshot after a small edit writes
+the few changed pages, the index blocks that list them and a manifest of a
+few KB.
+
+    python -m db.snapshots create | list | restore <id> <path> | prune
+
+(the store defaults to ``<database>.snapshots`` next to the active DB).
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from .backup import BackupError, ProgressCallback, backup_database
+
+CHUNK_SIZE = 4096
+INDEX_FANOUT = 64  # chunk hashes per index block
+_DIGEST_SIZE = 32
+
+
+def _chunk_path(store_dir: str, digest: str) -> str:
+    return os.path.join(store_dir, "chunks", digest[:2], digest)
+
+
+def _manifest_path(store_dir: str, snapshot_id: str) -> str:
+    return os.path.join(store_dir, "manifests", f"{snapshot_id}.json")
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _put(store_dir: str, data: bytes) -> Tuple[str, int]:
+    """Store `data` under its hash unless present; returns (digest, bytes written)."""
+    digest = hashlib.sha256(data).hexdigest()
+    path = _chunk_path(store_dir, digest)
+    if os.path.exists(path):
+        return digest, 0
+    packed = zlib.compress(data, 6)
+    _write_atomic(path, packed)
+    return digest, len(packed)
+
+
+def _get(store_dir: str, digest: str) -> bytes:
+    path = _chunk_path(store_dir, digest)
+    if not os.path.exists(path):
+        raise BackupError(f"snapshot store is missing chunk {digest}")
+    with open(path, "rb") as f:
+        data = zlib.decompress(f.read())
+    if hashlib.sha256(data).hexdigest() != digest:
+        raise BackupError(f"chunk {digest} is corrupt")
+    return data
+
+
+def _index_entries(store_dir: str, block_digest: str) -> List[str]:
+    block = _get(store_dir, block_digest)
+    return [block[i:i + _DIGEST_SIZE].hex() for i in range(0, len(block), _DIGEST_SIZE)]
+
+
+def _iter_chunks(path: str, chunk_size: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def create_snapshot(
+    source: sqlite3.Connection,
+    store_dir: str,
+    chunk_size: int = CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+) -> Dict:
+    """Snapshot the database behind `source` into `store_dir` and return its
+    manifest, plus ``new_chunks`` / ``new_bytes`` (what this snapshot wrote)."""
+    os.makedirs(store_dir, exist_ok=True)
+    fd, copy_path = tempfile.mkstemp(prefix=".snapshot-", suffix=".db", dir=store_dir)
+    os.close(fd)
+    try:
+        backup_database(source, copy_path, progress=progress)
+
+        digests: List[bytes] = []
+        new_chunks = new_bytes = 0
+        for chunk in _iter_chunks(copy_path, chunk_size):
+            digest, written = _put(store_dir, chunk)
+            digests.append(bytes.fromhex(digest))
+            new_chunks += bool(written)
+            new_bytes += written
+        size = os.path.getsize(copy_path)
+    finally:
+        os.remove(copy_path)
+
+    index: List[str] = []
+    for i in range(0, len(digests), INDEX_FANOUT):
+        digest, written = _put(store_dir, b"".join(digests[i:i + INDEX_FANOUT]))
+        index.append(digest)
+        new_bytes += written
+
+    created = datetime.now(timezone.utc)
+    manifest = {
+        "id": created.strftime("%Y%m%dT%H%M%S%fZ"),
+        "created": created.isoformat(timespec="seconds"),
+        "size": size,
+        "chunk_size": chunk_size,
+        "chunk_count": len(digests),
+        "index": index,
+    }
+    body = json.dumps(manifest, indent=2).encode("utf-8")
+    _write_atomic(_manifest_path(store_dir, manifest["id"]), body)
+    return {**manifest, "new_chunks": new_chunks, "new_bytes": new_bytes + len(body)}
+
+
+def load_manifest(store_dir: str, snapshot_id: str) -> Dict:
+    path = _manifest_path(store_dir, snapshot_id)
+    if not os.path.exists(path):
+        raise BackupError(f"no snapshot {snapshot_id!r} in {store_dir}")
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_snapshots(store_dir: str) -> List[Dict]:
+    """Manifests (without the index) oldest first."""
+    folder = os.path.join(store_dir, "manifests")
+    if not os.path.isdir(folder):
+        return []
+    result = []
+    for name in sorted(os.listdir(folder)):
+        if name.endswith(".json"):
+            manifest = load_manifest(store_dir, name[:-5])
+            del manifest["index"]
+            result.append(manifest)
+    return result
+
+
+def restore_snapshot(store_dir: str, snapshot_id: str, dest_path: str) -> str:
+    """Reassemble a snapshot into `dest_path` (a plain SQLite file), checking
+    every chunk against its hash."""
+    manifest = load_manifest(store_dir, snapshot_id)
+    tmp = f"{dest_path}.partial"
+    try:
+        with open(tmp, "wb") as out:
+            for block_digest in manifest["index"]:
+                for digest in _index_entries(store_dir, block_digest):
+                    out.write(_get(store_dir, digest))
+        if os.path.getsize(tmp) != manifest["size"]:
+            raise BackupError(f"snapshot {snapshot_id} reassembled to the wrong size")
+        os.replace(tmp, dest_path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return dest_path
+
+
+def prune_snapshots(store_dir: str, keep_last: int = 7, keep_daily: int = 30) -> Dict[str, int]:
+    """Delete snapshots outside the retention policy — keep the newest
+    `keep_last`, plus the newest one of each of the last `keep_daily` days
+    that have snapshots — then delete chunks no manifest references."""
+    snapshots = list_snapshots(store_dir)  # oldest first
+    keep: Set[str] = {s["id"] for s in snapshots[-keep_last:]} if keep_last > 0 else set()
+    days_seen: Set[str] = set()
+    for snap in reversed(snapshots):
+        day = snap["created"][:10]
+        if day not in days_seen and len(days_seen) < keep_daily:
+            days_seen.add(day)
+            keep.add(snap["id"])
+
+    removed = 0
+    for snap in snapshots:
+        if snap["id"] not in keep:
+            os.remove(_manifest_path(store_dir, snap["id"]))
+            removed += 1
+
+    referenced: Set[str] = set()
+    for snap_id in keep:
+        for block_digest in load_manifest(store_dir, snap_id)["index"]:
+            referenced.add(block_digest)
+            referenced.update(_index_entries(store_dir, block_digest))
+
+    freed_chunks = freed_bytes = 0
+    chunk_root = os.path.join(store_dir, "chunks")
+    if os.path.isdir(chunk_root):
+        for sub in os.listdir(chunk_root):
+            for digest in os.listdir(os.path.join(chunk_root, sub)):
+                if digest not in referenced:
+                    path = os.path.join(chunk_root, sub, digest)
+                    freed_bytes += os.path.getsize(path)
+                    os.remove(path)
+                    freed_chunks += 1
+
+    return {"removed_snapshots": removed, "kept_snapshots": len(keep), "freed_chunks": freed_chunks, "freed_bytes": freed_bytes}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from . import repository as repo
+
+    parser = argparse.ArgumentParser(description="Incremental database snapshots")
+    parser.add_argument("--db", help="database file (default: $SPENT_DB or ./spent.db)")
+    parser.add_argument("--store", help="snapshot directory (default: <database>.snapshots)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("create")
+    sub.add_parser("list")
+    restore = sub.add_parser("restore", help="write a snapshot out as a standalone DB file")
+    restore.add_argument("snapshot_id")
+    restore.add_argument("path")
+    prune = sub.add_parser("prune")
+    prune.add_argument("--keep-last", type=int, default=7)
+    prune.add_argument("--keep-daily", type=int, default=30)
+    args = parser.parse_args()
+
+    repo.configure_database(args.db)
+    store = args.store or repo.default_snapshot_dir()
+    if args.command == "create":
+        repo.init_db(apply_recurring=False)
+        snap = repo.snapshot_db(store)
+        print(f"{snap['id']}: {snap['chunk_count']} chunks, wrote {snap['new_chunks']} new ({snap['new_bytes']:,} bytes)")
+    elif args.command == "list":
+        for snap in list_snapshots(store):
+            print(f"{snap['id']}  {snap['created']}  {snap['size']:>12,} bytes  {snap['chunk_count']} chunks")
+    elif args.command == "restore":
+        print(restore_snapshot(store, args.snapshot_id, args.path))
+    else:
+        print(prune_snapshots(store, args.keep_last, args.keep_daily))
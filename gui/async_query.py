@@ -0,0 +1,175 @@
+"""Run repository calls off the GUI thread.
+
+`QueryRunner.submit(key, fn, ...)` executes `fn` on a small `QThreadPool` and
+delivers its result (or error) back on the GUI thread through queued
+signals. Requests are identified by a `key` ("budgets", "reports", ...):
+submitting again under the same key supersedes the previous request, so a
+filter change never paints results computed for the old filters. Superseded
+requests that have not started yet are skipped without touching the DB.
+
+Repository functions open their own short-lived session per call, so each
+worker thread checks a connection out of the engine's pool for the duration
+of the call and never shares it with another thread.
+"""
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from . import perf
+
+log = logging.getLogger(__name__)
+
+
+def _stage_name(key: str) -> str:
+    # "transactions.page.<id of the model>" -> "query.transactions.page",
+    # "transactions.refetch.<id>.<row>" -> "query.transactions.refetch"
+    parts = key.split(".")
+    while len(parts) > 1 and parts[-1].isdigit():
+        parts.pop()
+    return "query." + ".".join(parts)
+
+
+class _Request:
+    def __init__(self, generation: int, on_result, on_error, on_progress):
+        self.generation = generation
+        self.on_result = on_result
+        self.on_error = on_error
+        self.on_progress = on_progress
+
+
+class _Task(QRunnable):
+    def __init__(self, runner: "QueryRunner", key: str, generation: int, fn: Callable, args, kwargs):
+        super().__init__()
+        self._runner = runner
+        self._key = key
+        self._generation = generation
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+
+    def run(self):
+        runner, key, gen = self._runner, self._key, self._generation
+        if not runner._is_current(key, gen):
+            return  # superseded before it got a thread
+        t0 = time.perf_counter()
+        try:
+            result = self._fn(*self._args, **self._kwargs)
+        except Exception as e:
+            log.exception("background query %r failed", key)
+            runner._emit(runner._failed, key, gen, str(e))
+            return
+        finally:
+            perf.record(_stage_name(key), time.perf_counter() - t0)
+        runner._emit(runner._done, key, gen, result)
+
+
+class QueryRunner(QObject):
+    # emitted from worker threads, received on the runner's (GUI) thread
+    _done = Signal(str, int, object)
+    _failed = Signal(str, int, str)
+    _progress = Signal(str, int, object)
+
+    def __init__(self, max_threads: int = 2, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._generations: Dict[str, int] = {}
+        self._pending: Dict[str, _Request] = {}
+
+        self._done.connect(self._on_done)
+        self._failed.connect(self._on_failed)
+        self._progress.connect(self._on_progress)
+
+    # ----- public API -----
+
+    def submit(
+        self,
+        key: str,
+        fn: Callable,
+        *args,
+        on_result: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[str], None]] = None,
+        on_progress: Optional[Callable[[Any], None]] = None,
+        **kwargs,
+    ) -> int:
+        """Run `fn(*args, **kwargs)` in the background, replacing any pending
+        request with the same `key`. With `on_progress`, `fn` also receives a
+        thread-safe ``progress=`` callable. Returns the request generation."""
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+        self._pending[key] = _Request(generation, on_result, on_error, on_progress)
+
+        if on_progress is not None:
+            # progress(x) reports x; progress(done, total) reports the tuple
+            def progress(*values):
+                self._emit(self._progress, key, generation, values[0] if len(values) == 1 else values)
+
+            kwargs["progress"] = progress
+
+        self._pool.start(_Task(self, key, generation, fn, args, kwargs))
+        return generation
+
+    def cancel(self, key: str):
+        """Forget the pending request for `key`; its result will be dropped."""
+        if self._pending.pop(key, None) is not None:
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def is_pending(self, key: str) -> bool:
+        return key in self._pending
+
+    def busy(self) -> bool:
+        """Whether any request still waits for its result."""
+        return bool(self._pending)
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Block until running requests finish (used on shutdown)."""
+        self._pending.clear()
+        self._pool.clear()
+        return self._pool.waitForDone(msecs)
+
+    # ----- internals -----
+
+    def _is_current(self, key: str, generation: int) -> bool:
+        return self._generations.get(key) == generation
+
+    @staticmethod
+    def _emit(signal, *args):
+        try:
+            signal.emit(*args)
+        except RuntimeError:
+            pass  # runner already destroyed (application shutting down)
+
+    def _take(self, key: str, generation: int) -> Optional[_Request]:
+        request = self._pending.get(key)
+        if request is None or request.generation != generation:
+            return None  # stale: superseded or cancelled
+        del self._pending[key]
+        return request
+
+    def _on_done(self, key: str, generation: int, result):
+        request = self._take(key, generation)
+        if request is not None and request.on_result is not None:
+            request.on_result(result)
+
+    def _on_failed(self, key: str, generation: int, message: str):
+        request = self._take(key, generation)
+        if request is not None and request.on_error is not None:
+            request.on_error(message)
+
+    def _on_progress(self, key: str, generation: int, value):
+        request = self._pending.get(key)
+        if request is not None and request.generation == generation and request.on_progress is not None:
+            request.on_progress(value)
+
+
+_default_runner: Optional[QueryRunner] = None
+
+
+def default_runner() -> QueryRunner:
+    """The application-wide runner (created on first use, on the GUI thread)."""
+    global _default_runner
+    if _default_runner is None:
+        _default_runner = QueryRunner()
+    return _default_runner
@@ -0,0 +1,244 @@
+"""Hidden diagnostics page (Ctrl+Shift+D in the main window).
+
+Shows, refreshed live while the page is visible:
+
+- GUI stage timings from gui/perf.py (refreshes, table fills, chart draws,
+  background queries);
+- SQL statements per repository function and the latest slow queries with
+  their plans (db/instrumentation.py; tracing can be switched on here for
+  the session);
+- query-cache hit rate, database size and row counts, and process memory.
+"""
+import os
+import sys
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (
+    QCheckBox,
+    QFrame,
+    QGridLayout,
+    QHBoxLayout,
+    QLabel,
+    QPlainTextEdit,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from db import instrumentation
+from db.repository import cache_stats, get_db_stats, reset_cache_stats, set_sql_trace
+
+from . import perf
+from .async_query import default_runner
+
+REFRESH_MS = 1000
+DB_STATS_EVERY = 5  # refreshes; counting rows of a big table isn't free
+SLOW_QUERIES_SHOWN = 5
+
+
+def process_rss() -> Optional[int]:
+    """Resident memory of this process in bytes (None if unknown)."""
+    try:
+        import psutil  # optional
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource  # peak, not current, but better than nothing
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return None
+
+
+def _mb(n: Optional[int]) -> str:
+    return "n/a" if n is None else f"{n / (1024 * 1024):,.1f} MB"
+
+
+def _fill(table: QTableWidget, rows: List[List[str]]):
+    table.setRowCount(len(rows))
+    for r, values in enumerate(rows):
+        for c, value in enumerate(values):
+            item = QTableWidgetItem(value)
+            if c:
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            table.setItem(r, c, item)
+
+
+class DiagnosticsPage(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(8)
+
+        # --- header ---
+        header = QFrame()
+        header.setObjectName("Card")
+        header_layout = QHBoxLayout(header)
+        header_layout.setContentsMargins(16, 12, 16, 12)
+        title = QLabel("Diagnostics")
+        title.setStyleSheet("font-size: 14pt; font-weight: 600;")
+        header_layout.addWidget(title)
+        header_layout.addStretch()
+
+        self.trace_check = QCheckBox("Trace SQL (this session)")
+        self.trace_check.toggled.connect(self._toggle_trace)
+        header_layout.addWidget(self.trace_check)
+
+        reset_btn = QPushButton("Reset counters")
+        reset_btn.clicked.connect(self.reset_counters)
+        header_layout.addWidget(reset_btn)
+        layout.addWidget(header)
+
+        # --- summary numbers ---
+        summary = QFrame()
+        summary.setObjectName("Card")
+        grid = QGridLayout(summary)
+        grid.setContentsMargins(16, 12, 16, 12)
+        self.values: Dict[str, QLabel] = {}
+        for i, (key, label) in enumerate([
+            ("db_path", "Database"), ("db_size", "DB size"), ("profile", "Profile"),
+            ("rss", "Process memory"), ("cache", "Query cache"), ("rows", "Rows"),
+        ]):
+            grid.addWidget(QLabel(f"{label}:"), i // 2, (i % 2) * 2)
+            value = QLabel("…")
+            value.setTextInteractionFlags(Qt.TextSelectableByMouse)
+            grid.addWidget(value, i // 2, (i % 2) * 2 + 1)
+            self.values[key] = value
+        layout.addWidget(summary)
+
+        # --- tables ---
+        tables_row = QHBoxLayout()
+        tables_row.setSpacing(8)
+        self.stage_table = self._table_card(
+            tables_row, "GUI stages (ms)", ["Stage", "Count", "Last", "Avg", "Max"]
+        )
+        self.query_table = self._table_card(
+            tables_row, "SQL by repository function (ms)", ["Function", "Queries", "Total", "Max", "Slow"]
+        )
+        layout.addLayout(tables_row, 1)
+
+        slow_card = QFrame()
+        slow_card.setObjectName("Card")
+        slow_layout = QVBoxLayout(slow_card)
+        slow_layout.setContentsMargins(12, 12, 12, 12)
+        self.slow_title = QLabel("Slow queries")
+        self.slow_title.setStyleSheet("font-weight: 600;")
+        slow_layout.addWidget(self.slow_title)
+        self.slow_text = QPlainTextEdit()
+        self.slow_text.setReadOnly(True)
+        self.slow_text.setMaximumHeight(160)
+        slow_layout.addWidget(self.slow_text)
+        layout.addWidget(slow_card)
+
+        # live while visible
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+        self._ticks = 0
+
+    def _table_card(self, row_layout: QHBoxLayout, title: str, headers: List[str]) -> QTableWidget:
+        card = QFrame()
+        card.setObjectName("Card")
+        card_layout = QVBoxLayout(card)
+        card_layout.setContentsMargins(12, 12, 12, 12)
+        label = QLabel(title)
+        label.setStyleSheet("font-weight: 600;")
+        card_layout.addWidget(label)
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setStretchLastSection(True)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        card_layout.addWidget(table)
+        row_layout.addWidget(card, 1)
+        return table
+
+    # ----- live refresh -----
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.trace_check.blockSignals(True)
+        self.trace_check.setChecked(instrumentation.is_enabled())
+        self.trace_check.blockSignals(False)
+        self._ticks = 0
+        self.refresh()
+        self._timer.start()
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        """Redraw from the in-memory counters; DB numbers arrive from a worker."""
+        stages = perf.stage_stats()
+        _fill(self.stage_table, [
+            [name, str(s["count"]), f"{s['last'] * 1000:.1f}", f"{s['total'] / s['count'] * 1000:.1f}", f"{s['max'] * 1000:.1f}"]
+            for name, s in sorted(stages.items(), key=lambda kv: kv[1]["total"], reverse=True)
+        ])
+
+        queries = instrumentation.query_stats()
+        _fill(self.query_table, [
+            [name, str(q["count"]), f"{q['total_ms']:.1f}", f"{q['max_ms']:.1f}", str(q["slow"])]
+            for name, q in sorted(queries.items(), key=lambda kv: kv[1]["total_ms"], reverse=True)
+        ])
+        self._show_slow_queries()
+
+        cache = cache_stats()
+        self.values["cache"].setText(
+            f"{cache['hit_rate']:.0%} hits ({cache['hits']} / {cache['hits'] + cache['misses']}), "
+            f"{cache['size']} entries, {cache['invalidations']} invalidations"
+        )
+        self.values["rss"].setText(_mb(process_rss()))
+
+        if self._ticks % DB_STATS_EVERY == 0:
+            default_runner().submit("diagnostics", get_db_stats, on_result=self._show_db_stats)
+        self._ticks += 1
+
+    def _show_slow_queries(self):
+        if not instrumentation.is_enabled():
+            self.slow_title.setText("Slow queries (SQL tracing is off)")
+            self.slow_text.setPlainText("")
+            return
+        slow = instrumentation.slow_queries()[-SLOW_QUERIES_SHOWN:]
+        self.slow_title.setText(f"Slow queries (≥ {instrumentation.slow_query_ms():g} ms)")
+        lines = []
+        for q in reversed(slow):
+            lines.append(f"{q['at']}  {q['ms']:.1f} ms  {q['function']}")
+            lines.append(f"  {q['statement'][:300]}")
+            lines.extend(f"    {step}" for step in q["plan"])
+        self.slow_text.setPlainText("\n".join(lines))
+
+    def _show_db_stats(self, stats: Dict):
+        self.values["db_path"].setText(stats["path"])
+        size = _mb(stats["size_bytes"])
+        if stats["wal_bytes"]:
+            size += f" (+ {_mb(stats['wal_bytes'])} WAL)"
+        self.values["db_size"].setText(size)
+        self.values["profile"].setText(stats["profile"])
+        tables = stats["tables"]
+        self.values["rows"].setText(
+            ", ".join(f"{name} {count:,}" for name, count in tables.items())
+        )
+
+    # ----- actions -----
+
+    def _toggle_trace(self, enabled: bool):
+        set_sql_trace(enabled, persist=False)
+        self.refresh()
+
+    def reset_counters(self):
+        perf.reset_stage_stats()
+        instrumentation.reset_query_stats()
+        reset_cache_stats()
+        self.refresh()
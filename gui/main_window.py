@@ -22,24 +22,26 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, Signal, QPropertyAnimation
 from PySide6.QtWidgets import QApplication
-from PySide6.QtGui import QPixmap, QIcon
+from PySide6.QtGui import QPixmap, QIcon, QKeySequence, QShortcut
 import os
 import base64
+import logging
 import sys
 
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from typing import Optional, Dict
 from .transaction_form import TransactionForm
 from .transaction_list import TransactionListPage
 from .reports import ReportsPage
 from .settings import SettingsPage
+from .diagnostics import DiagnosticsPage
+from .refresh import RefreshCoordinator
+from .async_query import default_runner
+from .perf import measure, timed
 
 from db.repository import (
     add_transaction,
-    list_transactions,
+    list_transactions_page,
     get_totals,
-    filter_transactions,
     get_categories,
     get_expense_by_category_summary,
     get_budgets_with_status,
@@ -52,6 +54,17 @@ from db.repository import (
     set_setting,
 )
 
+log = logging.getLogger("spent.perf")
+
+
+DASHBOARD_RECENT_LIMIT = 5
+DIAGNOSTICS_PAGE = 6  # stack index of the hidden page (Ctrl+Shift+D)
+
+
+def _load_dashboard_data():
+    # runs on a worker thread (see refresh_dashboard)
+    return list_transactions_page(limit=DASHBOARD_RECENT_LIMIT), get_expense_by_category_summary()
+
 
 # ==========================================================
 # LIGHT THEME
@@ -139,7 +152,7 @@ def get_light_stylesheet() -> str:
     }
 
     /* Table */
-    QTableWidget {
+    QTableView {
         background-color: #ffffff;
         border-radius: 18px;
         border: 1px solid #dde2f0;
@@ -272,7 +285,7 @@ def get_dark_stylesheet() -> str:
     }
 
     /* Table */
-    QTableWidget {
+    QTableView {
         background-color: #1e293b;
         border-radius: 16px;
         border: 1px solid #273347;
@@ -287,7 +300,7 @@ def get_dark_stylesheet() -> str:
         border-bottom: 1px solid #36455d;
     }
 
-    QTableWidget::item:selected {
+    QTableView::item:selected {
         background-color: #4f46e5;
         color: white;
     }
@@ -369,6 +382,10 @@ class DashboardPage(QWidget):
         pie_title.setStyleSheet("font-weight: 600;")
         pie_layout.addWidget(pie_title)
 
+        # matplotlib is slow to import; only pay for it once the page is shown
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+
         self.pie_fig = Figure(figsize=(3, 3))
         self.pie_canvas = FigureCanvas(self.pie_fig)
         self.pie_ax = self.pie_fig.add_subplot(111)
@@ -402,6 +419,7 @@ class DashboardPage(QWidget):
         self.expense_value.setText(f"₹{expense:,.2f}")
         self.balance_value.setText(f"₹{balance:,.2f}")
 
+    @timed("dashboard.recent")
     def update_recent(self, rows):
         self.recent_table.setRowCount(0)
         for tx in rows[:5]:
@@ -416,6 +434,7 @@ class DashboardPage(QWidget):
             for c, v in enumerate(vals):
                 self.recent_table.setItem(r, c, QTableWidgetItem(str(v)))
 
+    @timed("dashboard.pie")
     def update_category_pie(self, totals_dict):
         self.pie_ax.clear()
 
@@ -577,7 +596,6 @@ class CategoriesPage(QWidget):
 
         created = create_category(name, type_str)
         if created:
-            self.refresh_table()
             self.categories_changed.emit()
 
     def update_category(self):
@@ -594,7 +612,6 @@ class CategoriesPage(QWidget):
 
         updated = update_category(cat_id, name, type_str)
         if updated:
-            self.refresh_table()
             self.categories_changed.emit()
 
     def delete_category(self):
@@ -606,7 +623,6 @@ class CategoriesPage(QWidget):
 
         deleted = delete_category(cat_id)
         if deleted:
-            self.refresh_table()
             self.categories_changed.emit()
 
 
@@ -683,8 +699,11 @@ class BudgetsPage(QWidget):
     # ---- public API called by MainWindow ----
 
     def refresh_data(self):
-        """Reload budgets and spending status from DB and update table."""
-        rows = get_budgets_with_status()
+        """Reload budgets and spending status in the background, then update the table."""
+        default_runner().submit("budgets", get_budgets_with_status, on_result=self._fill_table)
+
+    @timed("budgets.fill_table")
+    def _fill_table(self, rows):
         self.has_overspend = any(b["overspent"] for b in rows)
 
         self.table.setRowCount(0)
@@ -888,7 +907,6 @@ class BudgetsPage(QWidget):
         else:
             create_budget(category_id, amt, cyc)
 
-        self.refresh_data()
         self.budgets_changed.emit()
 
 
@@ -908,7 +926,6 @@ class BudgetsPage(QWidget):
 
         deleted = delete_budget(bid)
         if deleted:
-            self.refresh_data()
             self.budgets_changed.emit()
 
 
@@ -918,6 +935,11 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.setWindowTitle("Spent — Personal Expense Tracker")
         self.resize(1100, 700)
+        # set by app.py; background start-up phases are added to it
+        self.startup_timer = None
+        # last data shown, patched in place by row-level write deltas
+        self._totals = None
+        self._dashboard_data = None
         # load persisted theme
         theme = get_setting("theme", "light") or "light"
         self.current_theme = theme
@@ -1041,22 +1063,45 @@ class MainWindow(QMainWindow):
         content_layout.addWidget(self.stack)
         main_layout.addLayout(content_layout)
 
-        # Pages
-        self.dashboard_page = DashboardPage()
+        # Pages. Only the start page (Transactions) is built here; the others
+        # are placeholders until `_ensure_page` builds them on first show.
+        self.dashboard_page: Optional[DashboardPage] = None
+        self.categories_page: Optional[CategoriesPage] = None
+        self.budgets_page: Optional[BudgetsPage] = None
+        self.reports_page: Optional[ReportsPage] = None
+        self.settings_page: Optional[SettingsPage] = None
+        self.diagnostics_page: Optional[DiagnosticsPage] = None
         self.transactions_page = self._build_transactions_page()
-        self.categories_page = CategoriesPage()
-        self.budgets_page = BudgetsPage()
-        self.reports_page = ReportsPage()
-        self.settings_page = SettingsPage()
-
-        self.stack.addWidget(self.dashboard_page)
-        self.stack.addWidget(self.transactions_page)
-        self.stack.addWidget(self.categories_page)
-        self.stack.addWidget(self.budgets_page)
-        self.stack.addWidget(self.reports_page)
-        self.stack.addWidget(self.settings_page)
-        # when categories change from Category page -> refresh dropdowns
-        self.categories_page.categories_changed.connect(self.on_categories_changed)
+
+        self._page_factories = {
+            0: ("dashboard_page", DashboardPage),
+            2: ("categories_page", CategoriesPage),
+            3: ("budgets_page", BudgetsPage),
+            4: ("reports_page", ReportsPage),
+            5: ("settings_page", SettingsPage),
+            DIAGNOSTICS_PAGE: ("diagnostics_page", DiagnosticsPage),
+        }
+        for index in range(DIAGNOSTICS_PAGE + 1):
+            self.stack.addWidget(self.transactions_page if index == 1 else QWidget())
+        # hidden page without a nav button
+        self._page_before_diagnostics = 1
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, activated=self.toggle_diagnostics)
+
+        # Repository writes mark data domains dirty; refreshes are coalesced
+        # and only run for the visible page (plus the always-visible header
+        # and sidebar). Per-page targets are registered in `_ensure_page`.
+        self.refresh = RefreshCoordinator(self.stack, parent=self)
+        self.refresh.register(
+            "transaction_list", ("transactions", "categories"), self.transaction_list.reload, self.transactions_page,
+            apply_delta=self.transaction_list.apply_changes,
+        )
+        self.refresh.register("category_options", ("categories",), self.on_categories_changed, self.transactions_page)
+        self.refresh.register(
+            "header_totals", ("transactions",), self.refresh_totals, apply_delta=self._apply_totals_delta
+        )
+        self.refresh.register(
+            "budget_indicator", ("transactions", "budgets", "categories"), self._refresh_budget_indicator
+        )
 
         # initial category load
         self.on_categories_changed()
@@ -1074,7 +1119,6 @@ class MainWindow(QMainWindow):
         self._switch_page(1, self.btn_transactions)
         self.refresh_transactions()
         self.refresh_totals()
-        self.reports_page.refresh_data()
         # apply theme from settings
         try:
             if self.current_theme == "dark":
@@ -1085,15 +1129,48 @@ class MainWindow(QMainWindow):
                 self.theme_button.setText("🌙 Dark")
         except Exception:
             pass
-        # when categories change -> refresh dropdowns
-        self.categories_page.categories_changed.connect(self.on_categories_changed)
 
-        # when budgets change -> refresh alerts / indicators
-        self.budgets_page.budgets_changed.connect(self.refresh_budgets_ui)
-
-        # load categories + budgets initially
-        self.on_categories_changed()
+        # budget overspend indicator in the sidebar
         self.refresh_budgets_ui()
+
+    def _ensure_page(self, index: int) -> QWidget:
+        """Build the page at `index` the first time it is needed."""
+        entry = self._page_factories.get(index)
+        if entry is None:
+            return self.stack.widget(index)
+        attr, factory = entry
+        page = getattr(self, attr)
+        if page is not None:
+            return page
+
+        with measure(f"page.build.{attr}"):
+            page = factory()
+        placeholder = self.stack.widget(index)
+        self.stack.insertWidget(index, page)
+        self.stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        setattr(self, attr, page)
+
+        if page is self.dashboard_page:
+            self.refresh.register(
+                "dashboard", ("transactions", "categories"), self.refresh_dashboard, page,
+                apply_delta=self._apply_dashboard_delta,
+            )
+            self.refresh_dashboard()
+            self.refresh_totals()
+        elif page is self.categories_page:
+            self.refresh.register("categories_table", ("categories",), page.refresh_table, page)
+        elif page is self.budgets_page:
+            self.refresh.register("budgets_table", ("transactions", "budgets", "categories"), page.refresh_data, page)
+            page.refresh_data()
+        elif page is self.reports_page:
+            self.refresh.register("reports", ("transactions", "categories"), page.refresh_data, page)
+            page.refresh_data()
+        elif page is self.settings_page:
+            self.refresh.register("recurring_rules", ("recurring",), page.load_recurring_rules, page)
+            self.refresh.register("settings_values", ("settings",), page.load_settings, page)
+        return page
+
     def _build_transactions_page(self) -> QWidget:
         container = QWidget()
         layout = QVBoxLayout(container)
@@ -1148,31 +1225,106 @@ class MainWindow(QMainWindow):
             except Exception:
                 pass
 
-        # Always add the immediate transaction
+        # Always add the immediate transaction; the refresh coordinator
+        # picks up the write and updates whatever is visible
         add_transaction(data)
-        self.refresh_transactions()
-        self.refresh_totals()
-        self.reports_page.refresh_data()
-        self.refresh_budgets_ui()
 
-    def refresh_transactions(self):
-        rows = list_transactions()
-        self.transaction_list.set_transactions(rows)
+    def on_recurring_applied(self, created: int, seconds: float):
+        """Background recurring-rule catch-up finished (see gui/startup.py)."""
+        if self.startup_timer is not None:
+            self.startup_timer.add("recurring_catch_up", seconds)
+            log.info(self.startup_timer.summary())
+
+        # the generated rows already marked "transactions" dirty
+        if created:
+            self.statusBar().showMessage(f"Added {created} recurring transaction(s).", 5000)
 
-        # dashboard: recent transactions + top categories
-        if hasattr(self, "dashboard_page"):
-            self.dashboard_page.update_recent(rows)
-            cat_totals = get_expense_by_category_summary()
-            self.dashboard_page.update_category_pie(cat_totals)
+    def on_recurring_failed(self, message: str):
+        """Background recurring-rule catch-up raised (see gui/startup.py, which
+        logs the traceback)."""
+        if self.startup_timer is not None:
+            log.info(self.startup_timer.summary())
+        self.statusBar().showMessage(f"Recurring transactions were not added: {message}", 10000)
 
+    @timed("main.refresh_transactions")
+    def refresh_transactions(self):
+        self.transaction_list.reload()
+        self.refresh_dashboard()
+
+    def refresh_dashboard(self):
+        """Dashboard: recent transactions + top categories."""
+        if self.dashboard_page is None:
+            return
+        default_runner().submit("dashboard", _load_dashboard_data, on_result=self._show_dashboard)
+
+    def _show_dashboard(self, data):
+        recent, cat_totals = data
+        self._dashboard_data = (recent, cat_totals)
+        self.dashboard_page.update_recent(recent)
+        self.dashboard_page.update_category_pie(cat_totals)
+
+    def _apply_dashboard_delta(self, changes) -> bool:
+        """Patch recent rows + category pie from row changes; False = reload."""
+        if self._dashboard_data is None or default_runner().is_pending("dashboard"):
+            return False
+        recent, cat_totals = self._dashboard_data
+        was_full = len(recent) >= DASHBOARD_RECENT_LIMIT
+        # rows older than the last one shown may have unseen rows ahead of them
+        oldest = min((r["date"], r["id"]) for r in recent) if was_full else None
+        recent, cat_totals = list(recent), dict(cat_totals)
+
+        for change in changes:
+            before, after = change.get("before"), change.get("after")
+            if before is not None:
+                recent = [r for r in recent if r["id"] != before["id"]]
+                if before["type"] == "expense":
+                    name = before["category"] or "Uncategorized"
+                    cat_totals[name] = cat_totals.get(name, 0.0) - before["amount"]
+                    if abs(cat_totals[name]) < 1e-9:
+                        del cat_totals[name]
+            if after is not None:
+                recent.append(after)
+                if after["type"] == "expense":
+                    name = after["category"] or "Uncategorized"
+                    cat_totals[name] = cat_totals.get(name, 0.0) + after["amount"]
+
+        recent.sort(key=lambda r: (r["date"], r["id"]), reverse=True)
+        if oldest is not None:
+            recent = [r for r in recent if (r["date"], r["id"]) >= oldest]
+        if was_full and len(recent) < DASHBOARD_RECENT_LIMIT:
+            return False  # a row dropped out; the next-newest one isn't known here
+        self._show_dashboard((recent[:DASHBOARD_RECENT_LIMIT], dict(sorted(cat_totals.items()))))
+        return True
+
+    @timed("main.refresh_totals")
     def refresh_totals(self):
-        inc, exp, bal = get_totals()
+        default_runner().submit("header_totals", get_totals, on_result=self._show_totals)
+
+    def _apply_totals_delta(self, changes) -> bool:
+        if self._totals is None or default_runner().is_pending("header_totals"):
+            return False
+        inc, exp, _ = self._totals
+        for change in changes:
+            for row, sign in ((change.get("before"), -1), (change.get("after"), 1)):
+                if row is None:
+                    continue
+                if row["type"] == "income":
+                    inc += sign * row["amount"]
+                elif row["type"] == "expense":
+                    exp += sign * row["amount"]
+        self._show_totals((inc, exp, inc - exp))
+        return True
+
+    @timed("main.show_totals")
+    def _show_totals(self, totals):
+        self._totals = totals
+        inc, exp, bal = totals
         self.label_income.setText(f"Income: ₹{inc:,.2f}")
         self.label_expense.setText(f"Expense: ₹{exp:,.2f}")
         self.label_balance.setText(f"Balance: ₹{bal:,.2f}")
 
         # also update dashboard cards
-        if hasattr(self, "dashboard_page"):
+        if self.dashboard_page is not None:
             self.dashboard_page.update_totals(inc, exp, bal)
 
     # ---------- UI helpers ----------
@@ -1180,8 +1332,21 @@ class MainWindow(QMainWindow):
     def _switch_page(self, index, button):
         for b in self.nav_buttons:
             b.setChecked(False)
-        button.setChecked(True)
+        if button is not None:
+            button.setChecked(True)
+        page = self._ensure_page(index)
         self.stack.setCurrentIndex(index)
+        self.refresh.page_shown(page)
+
+    def toggle_diagnostics(self):
+        """Show the hidden diagnostics page, or go back to where we were."""
+        current = self.stack.currentIndex()
+        if current == DIAGNOSTICS_PAGE:
+            index = self._page_before_diagnostics
+            self._switch_page(index, self.nav_buttons[index])
+        else:
+            self._page_before_diagnostics = current
+            self._switch_page(DIAGNOSTICS_PAGE, None)
 
     def toggle_theme(self):
         if self.current_theme == "light":
@@ -1199,14 +1364,8 @@ class MainWindow(QMainWindow):
         except Exception:
             pass
     def apply_filters(self, f: dict):
-        rows = filter_transactions(
-            date_from=f["date_from"],
-            date_to=f["date_to"],
-            category=f["category"],
-            type_=f["type"],
-        )
-        self.transaction_list.set_transactions(rows)
-        self.refresh_totals()
+        # header totals are not filter-dependent, so only the list re-queries
+        self.transaction_list.set_filters(f)
     def on_categories_changed(self):
         """Reload categories from DB and push them into form + filters."""
         self.categories_data = get_categories()
@@ -1219,10 +1378,14 @@ class MainWindow(QMainWindow):
             self.transaction_list.set_category_options(self.categories_data)
     def refresh_budgets_ui(self):
         """Refresh budgets table + update overspend indicator."""
-        self.budgets_page.refresh_data()
-        overspent = getattr(self.budgets_page, "has_overspend", False)
-        self._update_budget_alert_indicator(overspent)
+        if self.budgets_page is not None:
+            self.budgets_page.refresh_data()
+        self._refresh_budget_indicator()
 
+    def _refresh_budget_indicator(self):
+        default_runner().submit(
+            "budget_indicator", any_budget_overspent, on_result=self._update_budget_alert_indicator
+        )
 
     def _update_budget_alert_indicator(self, overspent: bool):
         if overspent:
@@ -0,0 +1,108 @@
+"""Lightweight wall-clock timing for the GUI.
+
+`PhaseTimer` records consecutive phases (application start-up). `timed` and
+`measure` add to a process-wide registry of named stages ("reports.draw",
+"query.budgets", ...) that keeps a count, total, max and last duration per
+stage; benchmarks/bench_gui.py reads it for its per-stage breakdown.
+"""
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Tuple
+
+log = logging.getLogger("spent.perf")
+
+
+class PhaseTimer:
+    """Record consecutive named phases, e.g. the steps of application start-up.
+
+        timer = PhaseTimer("startup")
+        ...; timer.mark("init_db")
+        ...; timer.mark("main_window")
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.phases: List[Tuple[str, float]] = []
+
+    def mark(self, phase: str) -> float:
+        """Close the phase running since the previous mark; returns its seconds."""
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self._last = now
+        self.phases.append((phase, elapsed))
+        log.info("%s: %s took %.1f ms", self.name, phase, elapsed * 1000)
+        return elapsed
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Record a phase measured elsewhere (e.g. on a worker thread)."""
+        self.phases.append((phase, seconds))
+        log.info("%s: %s took %.1f ms", self.name, phase, seconds * 1000)
+
+    @property
+    def total(self) -> float:
+        return self._last - self.started
+
+    def summary(self) -> str:
+        parts = ", ".join(f"{name} {sec * 1000:.0f} ms" for name, sec in self.phases)
+        return f"{self.name}: {parts} (total {self.total * 1000:.0f} ms)"
+
+
+# ========== STAGE REGISTRY ==========
+
+_stages: Dict[str, List[float]] = {}  # name -> [count, total, max, last]
+_stages_lock = threading.Lock()  # worker threads record query stages
+
+
+def record(stage: str, seconds: float) -> None:
+    with _stages_lock:
+        entry = _stages.get(stage)
+        if entry is None:
+            _stages[stage] = [1, seconds, seconds, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+            entry[3] = seconds
+
+
+@contextmanager
+def measure(stage: str) -> Iterator[None]:
+    """Time the body of a ``with`` block as `stage`."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - t0)
+
+
+def timed(stage: str) -> Callable:
+    """Decorator: time every call of the function as `stage`."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(stage, time.perf_counter() - t0)
+        return wrapper
+    return decorate
+
+
+def stage_stats() -> Dict[str, Dict[str, float]]:
+    """Snapshot of every stage: count, total, max and last (seconds)."""
+    with _stages_lock:
+        return {
+            name: {"count": count, "total": total, "max": max_, "last": last}
+            for name, (count, total, max_, last) in _stages.items()
+        }
+
+
+def reset_stage_stats() -> None:
+    with _stages_lock:
+        _stages.clear()
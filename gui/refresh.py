@@ -0,0 +1,147 @@
+"""Coalesced, visibility-aware refreshing of the main window.
+
+Repository writes report which data domains they touched (see
+`db.repository.add_write_listener`). The coordinator collects those dirty
+domains for a short moment, then runs every refresh target interested in
+them — but only if the target's page is visible. Targets on hidden pages are
+remembered as stale and refreshed when their page is shown.
+
+Targets that can patch themselves (`apply_delta`) receive the changed rows of
+single-row transaction writes right away and skip the reload when the patch
+succeeds.
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtWidgets import QStackedWidget, QWidget
+
+from db.repository import add_write_listener, remove_write_listener
+
+from .perf import timed
+
+
+DeltaHandler = Callable[[List[Dict]], bool]
+
+
+class _Target:
+    def __init__(
+        self,
+        name: str,
+        domains: Iterable[str],
+        callback: Callable[[], None],
+        page: Optional[QWidget],
+        apply_delta: Optional[DeltaHandler],
+    ):
+        self.name = name
+        self.domains = set(domains)
+        self.callback = callback
+        self.page = page
+        self.apply_delta = apply_delta
+
+
+class RefreshCoordinator(QObject):
+    # hops repository notifications (possibly from worker threads) to the GUI thread
+    _write_seen = Signal(str, object)
+
+    def __init__(self, stack: QStackedWidget, delay_ms: int = 30, parent=None):
+        super().__init__(parent)
+        self._stack = stack
+        self._targets: Dict[str, _Target] = {}
+        self._dirty: Set[str] = set()  # target names waiting for the timer
+        self._stale: Set[str] = set()  # target names waiting for their page
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self.flush)
+
+        self._write_seen.connect(self._on_write)
+        add_write_listener(self._on_repository_write)
+
+    def _on_repository_write(self, domain: str, changes: Optional[List[Dict]]):
+        try:
+            self._write_seen.emit(domain, changes)
+        except RuntimeError:
+            # the coordinator's Qt object is gone (window closed)
+            remove_write_listener(self._on_repository_write)
+
+    def detach(self):
+        remove_write_listener(self._on_repository_write)
+
+    # ----- registration -----
+
+    def register(
+        self,
+        name: str,
+        domains: Iterable[str],
+        callback: Callable[[], None],
+        page: Optional[QWidget] = None,
+        apply_delta: Optional[DeltaHandler] = None,
+    ):
+        """Run `callback` when any of `domains` changes. With a `page`, only
+        while that page is the visible one; otherwise on every change.
+
+        `apply_delta(changes)` is offered row-level transaction changes first
+        and returns True if it patched the target in place (no reload needed).
+        """
+        self._targets[name] = _Target(name, domains, callback, page, apply_delta)
+
+    # ----- dirty tracking -----
+
+    def _on_write(self, domain: str, changes: Optional[List[Dict]]):
+        for target in self._targets.values():
+            if domain not in target.domains or target.name in self._dirty:
+                continue
+            if (
+                changes is not None
+                and target.apply_delta is not None
+                and target.name not in self._stale
+                and target.apply_delta(changes)
+            ):
+                continue
+            self._mark(target.name)
+
+    def mark_dirty(self, *domains: str):
+        """Schedule a reload of every target interested in `domains`."""
+        for target in self._targets.values():
+            if target.domains & set(domains):
+                self._mark(target.name)
+
+    def _mark(self, name: str):
+        self._dirty.add(name)
+        # don't restart a running timer: a stream of writes must not starve the refresh
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def has_pending(self) -> bool:
+        """Whether a coalesced refresh is still waiting to run."""
+        return bool(self._dirty)
+
+    @timed("refresh.flush")
+    def flush(self):
+        self._timer.stop()
+        dirty, self._dirty = self._dirty, set()
+        if not dirty:
+            return
+
+        current = self._stack.currentWidget()
+        due: List[_Target] = []
+        for target in self._targets.values():
+            if target.name not in dirty:
+                continue
+            if target.page is None or target.page is current:
+                due.append(target)
+            else:
+                self._stale.add(target.name)
+
+        for target in due:
+            self._stale.discard(target.name)
+            target.callback()
+
+    def page_shown(self, page: QWidget):
+        """Bring stale targets of a page that just became visible up to date."""
+        for name in list(self._stale):
+            target = self._targets.get(name)
+            if target is not None and target.page is page:
+                self._stale.discard(name)
+                target.callback()
@@ -1,18 +1,25 @@
 from typing import List, Dict
-import numpy as np
-from matplotlib.patches import ConnectionPatch
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QFrame, QHBoxLayout
 from PySide6.QtCore import Qt
 
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-
 from db.repository import (
     get_expense_by_category_summary,
     get_monthly_income_expense_summary,
     get_balance_timeseries,
 )
 
+from .async_query import default_runner
+from .perf import timed
+
+
+def _load_report_data() -> Dict:
+    # runs on a worker thread (see ReportsPage.refresh_data)
+    return {
+        "expense_by_category": get_expense_by_category_summary(),
+        "monthly": get_monthly_income_expense_summary(),
+        "balance": get_balance_timeseries(),
+    }
+
 
 class ReportsPage(QWidget):
     def __init__(self, parent=None):
@@ -70,6 +77,10 @@ class ReportsPage(QWidget):
         label.setStyleSheet("font-weight: 600;")
         card_layout.addWidget(label)
 
+        # imported here so merely importing this module doesn't load matplotlib
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+
         fig = Figure(figsize=(4, 3))
         canvas = FigureCanvas(fig)
         ax = fig.add_subplot(111)
@@ -83,18 +94,23 @@ class ReportsPage(QWidget):
     # ------------ PUBLIC API ------------
 
     def refresh_data(self):
-        """Call this whenever transactions change."""
-        self._draw_expense_pie()
-        self._draw_monthly_bar()
-        self._draw_balance_line()
+        """Call this whenever transactions change. The summaries are queried
+        in the background; the charts are redrawn when they arrive."""
+        default_runner().submit("reports", _load_report_data, on_result=self._draw_all)
+
+    @timed("reports.draw")
+    def _draw_all(self, data: Dict):
+        self._draw_expense_pie(data["expense_by_category"])
+        self._draw_monthly_bar(data["monthly"])
+        self._draw_balance_line(data["balance"])
 
     # ------------ INDIVIDUAL CHART DRAWS ------------
 
-    def _draw_expense_pie(self):
+    @timed("reports.draw.expense_pie")
+    def _draw_expense_pie(self, data: Dict[str, float]):
         self.pie_ax.clear()
         self.pie_ax.set_title("Expense by Category", fontsize=10, pad=6)
 
-        data = get_expense_by_category_summary()
         if not data:
             self.pie_ax.text(
                 0.5, 0.5, "No expense data",
@@ -138,11 +154,11 @@ class ReportsPage(QWidget):
 
 
 
-    def _draw_monthly_bar(self):
+    @timed("reports.draw.monthly_bar")
+    def _draw_monthly_bar(self, rows: List[Dict]):
         self.bar_ax.clear()
         self.bar_ax.set_title("Monthly Income vs Expense", fontsize=10, pad=10)
 
-        rows = get_monthly_income_expense_summary()
         if not rows:
             self.bar_ax.text(
                 0.5, 0.5, "No monthly data",
@@ -178,11 +194,11 @@ class ReportsPage(QWidget):
         self.bar_canvas.draw_idle()
 
 
-    def _draw_balance_line(self):
+    @timed("reports.draw.balance_line")
+    def _draw_balance_line(self, points: List[Dict]):
         self.balance_ax.clear()
         self.balance_ax.set_title("Balance Over Time", fontsize=10, pad=10)
 
-        points = get_balance_timeseries()
         if not points:
             self.balance_ax.text(
                 0.5, 0.5, "No data yet",
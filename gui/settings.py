@@ -24,9 +24,16 @@ from db.repository import (
     restore_db,
     set_setting,
     get_setting,
+    get_db_profile,
+    set_db_profile,
+    get_db_path,
+    open_database,
 )
+from db.pragmas import PROFILES
 from db.repository import create_recurring_rule, list_recurring_rules, delete_recurring_rule, wipe_all_data
 
+from .async_query import default_runner
+
 
 class SettingsPage(QWidget):
     def __init__(self, parent=None):
@@ -43,11 +50,6 @@ class SettingsPage(QWidget):
         row.addWidget(QLabel("Currency:"))
         self.currency = QComboBox()
         self.currency.addItems(["₹ (INR)", "$ (USD)", "€ (EUR)", "£ (GBP)"])
-        current = get_setting("currency", "₹ (INR)")
-        if current:
-            idx = self.currency.findText(current)
-            if idx >= 0:
-                self.currency.setCurrentIndex(idx)
         row.addWidget(self.currency)
         save_cur = QPushButton("Save")
         save_cur.clicked.connect(self.save_currency)
@@ -59,19 +61,11 @@ class SettingsPage(QWidget):
         row2.addWidget(QLabel("Start of Week:"))
         self.week_start = QComboBox()
         self.week_start.addItems(["Sunday", "Monday"])
-        ws = get_setting("week_start", "Monday")
-        idx = self.week_start.findText(ws)
-        if idx >= 0:
-            self.week_start.setCurrentIndex(idx)
         row2.addWidget(self.week_start)
 
         row2.addWidget(QLabel("Start of Month (day):"))
         self.month_start = QComboBox()
         self.month_start.addItems([str(i) for i in range(1, 29)])
-        ms = get_setting("month_start", "1")
-        idx = self.month_start.findText(ms)
-        if idx >= 0:
-            self.month_start.setCurrentIndex(idx)
         row2.addWidget(self.month_start)
 
         save_cycle = QPushButton("Save")
@@ -79,6 +73,21 @@ class SettingsPage(QWidget):
         row2.addWidget(save_cycle)
         layout.addLayout(row2)
 
+        # SQLite tuning profile (see db/pragmas.py)
+        row3 = QHBoxLayout()
+        row3.addWidget(QLabel("Database profile:"))
+        self.db_profile = QComboBox()
+        self.db_profile.addItems(list(PROFILES))
+        self.db_profile.setToolTip(
+            "safe: fsync every commit · balanced: WAL, fsync at checkpoints · fast: WAL, no fsync"
+        )
+        row3.addWidget(self.db_profile)
+        save_profile = QPushButton("Save")
+        save_profile.clicked.connect(self.save_db_profile)
+        row3.addWidget(save_profile)
+        row3.addStretch()
+        layout.addLayout(row3)
+
         # Export / Import
         ex_row = QHBoxLayout()
         self.export_csv_btn = QPushButton("Export CSV")
@@ -97,6 +106,10 @@ class SettingsPage(QWidget):
         ex_row.addWidget(self.import_json_btn)
         layout.addLayout(ex_row)
 
+        # progress of the import / export running in the background
+        self.io_status = QLabel("")
+        layout.addWidget(self.io_status)
+
         # Backup / Restore DB
         br_row = QHBoxLayout()
         self.backup_btn = QPushButton("Backup DB")
@@ -107,6 +120,17 @@ class SettingsPage(QWidget):
         br_row.addWidget(self.restore_btn)
         layout.addLayout(br_row)
 
+        # Active database file; another one can be opened (or created) in place
+        db_row = QHBoxLayout()
+        self.db_path_label = QLabel()
+        self.db_path_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self.open_db_btn = QPushButton("Open Database…")
+        self.open_db_btn.clicked.connect(self.open_database)
+        db_row.addWidget(QLabel("Database:"))
+        db_row.addWidget(self.db_path_label, 1)
+        db_row.addWidget(self.open_db_btn)
+        layout.addLayout(db_row)
+
         # Wipe Data button
         wipe_row = QHBoxLayout()
         self.wipe_btn = QPushButton("🗑 Wipe Data")
@@ -139,77 +163,175 @@ class SettingsPage(QWidget):
         self.rr_add_btn.clicked.connect(self.add_recurring_rule)
         self.rr_del_btn.clicked.connect(self.delete_recurring_rule)
 
+        self.load_settings()
         self.load_recurring_rules()
 
+    def load_settings(self):
+        """Show the stored settings of the active database."""
+        for combo, key, default in (
+            (self.currency, "currency", "₹ (INR)"),
+            (self.week_start, "week_start", "Monday"),
+            (self.month_start, "month_start", "1"),
+        ):
+            idx = combo.findText(get_setting(key, default) or default)
+            if idx >= 0:
+                combo.setCurrentIndex(idx)
+        self.db_profile.setCurrentText(get_db_profile())
+        self.db_path_label.setText(get_db_path())
+
+    def open_database(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Open or Create Database", get_db_path(), "DB Files (*.db);;All Files (*)",
+            options=QFileDialog.DontConfirmOverwrite,
+        )
+        if not path:
+            return
+        self.open_db_btn.setEnabled(False)
+
+        def on_result(_resolved):
+            # every page refreshes itself: open_database reports all domains as changed
+            self.open_db_btn.setEnabled(True)
+
+        def on_error(message):
+            self.open_db_btn.setEnabled(True)
+            QMessageBox.warning(self, "Error", f"Could not open database: {message}")
+
+        default_runner().submit("settings.open_database", open_database, path, on_result=on_result, on_error=on_error)
+
     def save_currency(self):
         cur = self.currency.currentText()
         set_setting("currency", cur)
         QMessageBox.information(self, "Saved", "Currency saved.")
 
+    def save_db_profile(self):
+        set_db_profile(self.db_profile.currentText())
+        QMessageBox.information(self, "Saved", "Database profile saved.")
+
     def save_cycle_settings(self):
         set_setting("week_start", self.week_start.currentText())
         set_setting("month_start", self.month_start.currentText())
         QMessageBox.information(self, "Saved", "Cycle settings saved.")
 
+    # ----- import / export (run in the background) -----
+
+    def _io_buttons(self):
+        return [
+            self.export_csv_btn, self.export_json_btn, self.import_csv_btn, self.import_json_btn,
+            self.backup_btn, self.restore_btn,
+        ]
+
+    def _run_io(self, fn, path: str, on_done, failure: str, progress_text=None):
+        """Run an import/export/backup on the worker pool; buttons stay
+        disabled until it finishes so two file jobs never overlap.
+        `progress_text(value)` formats progress reports for the status line."""
+        for btn in self._io_buttons():
+            btn.setEnabled(False)
+        self.io_status.setText("Working…")
+
+        def finish():
+            for btn in self._io_buttons():
+                btn.setEnabled(True)
+            self.io_status.setText("")
+
+        def on_result(result):
+            finish()
+            on_done(result)
+
+        def on_error(message):
+            finish()
+            QMessageBox.warning(self, "Error", f"{failure}: {message}")
+
+        on_progress = None
+        if progress_text is not None:
+            def on_progress(value):
+                self.io_status.setText(progress_text(value))
+
+        default_runner().submit(
+            "settings.file_io", fn, path,
+            on_result=on_result, on_error=on_error, on_progress=on_progress,
+        )
+
     def export_csv(self):
-        path, _ = QFileDialog.getSaveFileName(self, "Export CSV", "transactions.csv", "CSV Files (*.csv)")
+        path, _ = QFileDialog.getSaveFileName(self, "Export CSV", "transactions.csv", "CSV Files (*.csv *.csv.gz)")
         if not path:
             return
-        try:
-            export_transactions_csv(path)
-            QMessageBox.information(self, "Exported", f"Exported to {path}")
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Export failed: {e}")
+        self._run_io(
+            export_transactions_csv, path,
+            lambda _: QMessageBox.information(self, "Exported", f"Exported to {path}"),
+            "Export failed",
+        )
 
     def export_json(self):
-        path, _ = QFileDialog.getSaveFileName(self, "Export JSON", "transactions.json", "JSON Files (*.json)")
+        path, _ = QFileDialog.getSaveFileName(self, "Export JSON", "transactions.json", "JSON Files (*.json *.json.gz)")
         if not path:
             return
-        try:
-            export_transactions_json(path)
-            QMessageBox.information(self, "Exported", f"Exported to {path}")
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Export failed: {e}")
+        self._run_io(
+            export_transactions_json, path,
+            lambda _: QMessageBox.information(self, "Exported", f"Exported to {path}"),
+            "Export failed",
+        )
 
     def import_csv(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Import CSV", "", "CSV Files (*.csv)")
+        path, _ = QFileDialog.getOpenFileName(self, "Import CSV", "", "CSV Files (*.csv *.csv.gz)")
         if not path:
             return
-        try:
-            count = import_transactions_csv(path)
-            QMessageBox.information(self, "Imported", f"Imported {count} rows from CSV.")
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Import failed: {e}")
+        self._run_io(
+            import_transactions_csv, path,
+            lambda count: QMessageBox.information(self, "Imported", f"Imported {count} rows from CSV."),
+            "Import failed",
+            progress_text=lambda count: f"Imported {count:,} rows…",
+        )
 
     def import_json(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Import JSON", "", "JSON Files (*.json)")
+        path, _ = QFileDialog.getOpenFileName(self, "Import JSON", "", "JSON Files (*.json *.json.gz)")
         if not path:
             return
-        try:
-            count = import_transactions_json(path)
-            QMessageBox.information(self, "Imported", f"Imported {count} rows from JSON.")
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Import failed: {e}")
+        self._run_io(
+            import_transactions_json, path,
+            lambda count: QMessageBox.information(self, "Imported", f"Imported {count} rows from JSON."),
+            "Import failed",
+            progress_text=lambda count: f"Imported {count:,} rows…",
+        )
 
     def backup_db(self):
-        path, _ = QFileDialog.getSaveFileName(self, "Backup DB", "spent_backup.db", "DB Files (*.db);;All Files (*)")
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Backup DB", "spent_backup.db", "DB Files (*.db);;Compressed DB Files (*.db.gz);;All Files (*)"
+        )
         if not path:
             return
-        ok = backup_db(path)
-        if ok:
-            QMessageBox.information(self, "Backup", f"Backup created at {path}")
-        else:
-            QMessageBox.warning(self, "Error", "Backup failed.")
+
+        def on_done(ok):
+            if ok:
+                QMessageBox.information(self, "Backup", f"Backup created at {path}")
+            else:
+                QMessageBox.warning(self, "Error", "Backup failed.")
+
+        # *.gz names are compressed by backup_db
+        self._run_io(
+            backup_db, path, on_done, "Backup failed",
+            progress_text=lambda pages: f"Backing up… {pages[0] * 100 // max(pages[1], 1)}%",
+        )
 
     def restore_db(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Restore DB", "", "DB Files (*.db);;All Files (*)")
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Restore DB", "", "DB Files (*.db *.db.gz);;All Files (*)"
+        )
         if not path:
             return
-        ok = restore_db(path)
-        if ok:
-            QMessageBox.information(self, "Restore", "Database restored. Restart app to apply changes.")
-        else:
-            QMessageBox.warning(self, "Error", "Restore failed.")
+        reply = QMessageBox.question(
+            self, "Restore DB", "Replace all current data with this backup?", QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+
+        def on_done(ok):
+            # on success every page refreshes itself (restore reports all domains as changed)
+            if ok:
+                QMessageBox.information(self, "Restore", "Database restored.")
+            else:
+                QMessageBox.warning(self, "Error", "Restore failed: the file is not a valid Spent backup.")
+
+        self._run_io(restore_db, path, on_done, "Restore failed")
 
     def wipe_data(self):
         reply = QMessageBox.question(
@@ -270,7 +392,6 @@ class SettingsPage(QWidget):
                 }
                 create_recurring_rule(data)
                 dlg.accept()
-                self.load_recurring_rules()
             except Exception as e:
                 QMessageBox.warning(self, "Error", f"Invalid input: {e}")
 
@@ -289,4 +410,3 @@ class SettingsPage(QWidget):
         if ok != QMessageBox.Yes:
             return
         delete_recurring_rule(rid)
-        self.load_recurring_rules()
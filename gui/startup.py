@@ -0,0 +1,47 @@
+"""Start-up work that must not delay the first paint."""
+import logging
+import time
+
+from PySide6.QtCore import QObject, QThread, Signal
+
+from db.repository import apply_recurring_rules
+
+log = logging.getLogger(__name__)
+
+
+class RecurringCatchUpWorker(QObject):
+    """Runs `apply_recurring_rules()` on a background thread.
+
+    `finished(created, seconds)` is delivered on the GUI thread once the
+    catch-up is done; `failed(message)` if it raised.
+    """
+
+    finished = Signal(int, float)
+    failed = Signal(str)
+
+    def __init__(self):
+        super().__init__()
+        self._thread = None
+
+    def start(self):
+        self._thread = QThread()
+        self.moveToThread(self._thread)
+        self._thread.started.connect(self._run)
+        self.finished.connect(self._thread.quit)
+        self.failed.connect(self._thread.quit)
+        self._thread.start()
+
+    def _run(self):
+        t0 = time.perf_counter()
+        try:
+            created = apply_recurring_rules()
+        except Exception as e:
+            log.exception("recurring-rule catch-up failed")
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(created, time.perf_counter() - t0)
+
+    def wait(self, msecs: int = -1) -> bool:
+        if self._thread is None:
+            return True
+        return self._thread.wait() if msecs < 0 else self._thread.wait(msecs)
@@ -1,11 +1,12 @@
-from typing import List, Dict, Optional
+from collections import OrderedDict
+from typing import List, Dict, Optional, Set, Tuple
 
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
+    QAbstractItemView,
     QLabel,
     QComboBox,
     QDateEdit,
@@ -17,9 +18,274 @@ from PySide6.QtWidgets import (
     QTextEdit,
     QMessageBox,
 )
-from PySide6.QtCore import QDate, Signal
+from PySide6.QtCore import QDate, Signal, Qt, QAbstractTableModel, QModelIndex
 
-from db.repository import update_transaction, delete_transaction
+from db.repository import update_transaction, delete_transaction, list_transactions_page
+
+from .async_query import QueryRunner, default_runner
+from .perf import timed
+
+
+class TransactionTableModel(QAbstractTableModel):
+    """Lazily paged transactions (newest first).
+
+    Only the (date, id) sort key of every loaded row is kept; full row dicts
+    live in a bounded LRU cache and are re-read a page at a time through
+    keyset pagination when the view scrolls back to them.
+
+    With a `runner`, pages requested by the view are loaded in the background
+    and appended when they arrive, and evicted rows are shown empty until
+    their page has been re-read the same way; changing filters drops any
+    page still in flight for the old filters.
+
+    Single-row writes are patched in with `apply_changes` (sorted position,
+    active filters respected) instead of reloading.
+    """
+
+    HEADERS = ["ID", "Date", "Amount", "Type", "Category", "Payment", "Tags", "Note"]
+    KEYS = ["id", "date", "amount", "type", "category", "payment_method", "tags", "note"]
+
+    def __init__(
+        self,
+        page_size: int = 200,
+        max_cached_rows: int = 2000,
+        runner: Optional[QueryRunner] = None,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.page_size = page_size
+        self.max_cached_rows = max(max_cached_rows, page_size)
+        self._runner = runner
+        self._request_key = f"transactions.page.{id(self)}"
+
+        self._filters: Dict = {}
+        self._keys: List[Tuple[str, int]] = []
+        self._rows: "OrderedDict[int, Dict]" = OrderedDict()
+        self._exhausted = False
+        self._loading = False
+        self._refetching: Set[int] = set()  # starts of evicted pages being re-read
+
+    # ----- loading -----
+
+    @timed("transactions.reset")
+    def set_filters(self, filters: Optional[Dict] = None):
+        """Drop everything loaded and start paging again with `filters`
+        (keys: date_from, date_to, category, type)."""
+        if self._runner is not None:
+            self._runner.cancel(self._request_key)
+        self._cancel_refetches()
+        self.beginResetModel()
+        self._filters = dict(filters or {})
+        self._keys = []
+        self._rows.clear()
+        self._exhausted = False
+        self._loading = False
+        self.endResetModel()
+
+    def reload(self):
+        self.set_filters(self._filters)
+
+    @staticmethod
+    def _query_page(filters: Dict, after: Optional[Tuple[str, int]], limit: int) -> List[Dict]:
+        # may run on a worker thread: only touches its arguments
+        return list_transactions_page(
+            limit=limit,
+            after=after,
+            date_from=filters.get("date_from"),
+            date_to=filters.get("date_to"),
+            category=filters.get("category"),
+            type_=filters.get("type"),
+        )
+
+    def _cache_rows(self, rows: List[Dict]):
+        for row in rows:
+            self._rows[row["id"]] = row
+            self._rows.move_to_end(row["id"])
+        while len(self._rows) > self.max_cached_rows:
+            self._rows.popitem(last=False)
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        args = (dict(self._filters), self._keys[-1] if self._keys else None, self.page_size)
+        if self._runner is None:
+            self._append_page(self._query_page(*args))
+            return
+        self._loading = True
+        self._runner.submit(
+            self._request_key, self._query_page, *args,
+            on_result=self._append_page, on_error=self._on_page_failed,
+        )
+
+    def _refetch_key(self, start: int) -> str:
+        return f"transactions.refetch.{id(self)}.{start}"
+
+    def _refetch(self, start: int):
+        """Re-read the evicted page starting at row `start` in the background."""
+        if start in self._refetching:
+            return
+        self._refetching.add(start)
+        after = self._keys[start - 1] if start else None
+        self._runner.submit(
+            self._refetch_key(start), self._query_page, dict(self._filters), after, self.page_size,
+            on_result=lambda rows: self._on_refetched(start, rows),
+            on_error=lambda message: self._refetching.discard(start),
+        )
+
+    def _on_refetched(self, start: int, rows: List[Dict]):
+        self._refetching.discard(start)
+        self._cache_rows(rows)
+        found = [i for i in (self._index_of((r["date"], r["id"])) for r in rows) if i is not None]
+        if found:
+            self.dataChanged.emit(self.index(min(found), 0), self.index(max(found), self.columnCount() - 1))
+
+    def _cancel_refetches(self):
+        # their rows may predate a write or belong to other filters
+        for start in self._refetching:
+            self._runner.cancel(self._refetch_key(start))
+        self._refetching.clear()
+
+    def _on_page_failed(self, message: str):
+        # stop paging rather than retrying on every scroll
+        self._loading = False
+        self._exhausted = True
+
+    @timed("transactions.append_page")
+    def _append_page(self, rows: List[Dict]):
+        self._loading = False
+        self._cache_rows(rows)
+        if len(rows) < self.page_size:
+            self._exhausted = True
+        if not rows:
+            return
+        first = len(self._keys)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._keys.extend((r["date"], r["id"]) for r in rows)
+        self.endInsertRows()
+
+    # ----- in-place updates -----
+
+    def _matches(self, row: Dict) -> bool:
+        # mirrors db.repository._transaction_filters
+        f = self._filters
+        if f.get("date_from") and row["date"] < f["date_from"]:
+            return False
+        if f.get("date_to") and row["date"] > f["date_to"]:
+            return False
+        category = f.get("category")
+        if category and category.lower() != "all" and row["category"] != category:
+            return False
+        type_ = f.get("type")
+        if type_ and type_.lower() != "all" and row["type"] != type_.lower():
+            return False
+        return True
+
+    def _position(self, key: Tuple[str, int]) -> int:
+        """Index of the first loaded row that sorts at or after `key` (newest first)."""
+        lo, hi = 0, len(self._keys)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._keys[mid] > key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _index_of(self, key: Tuple[str, int]) -> Optional[int]:
+        i = self._position(key)
+        return i if i < len(self._keys) and self._keys[i] == key else None
+
+    def _remove(self, key: Tuple[str, int]):
+        i = self._index_of(key)
+        if i is None:
+            return
+        self.beginRemoveRows(QModelIndex(), i, i)
+        del self._keys[i]
+        self._rows.pop(key[1], None)
+        self.endRemoveRows()
+
+    def _insert(self, row: Dict):
+        key = (row["date"], row["id"])
+        i = self._position(key)
+        if i == len(self._keys) and not self._exhausted:
+            return  # past the loaded pages: it arrives with a later page
+        self.beginInsertRows(QModelIndex(), i, i)
+        self._keys.insert(i, key)
+        self._cache_rows([row])
+        self.endInsertRows()
+
+    @timed("transactions.apply_changes")
+    def apply_changes(self, changes: List[Dict]) -> bool:
+        """Apply repository row changes ({"before": row|None, "after": row|None}).
+        Returns False if the model can't patch itself and needs a reload."""
+        if self._loading:
+            return False  # the page in flight may or may not contain these rows
+        self._cancel_refetches()
+        for change in changes:
+            before, after = change.get("before"), change.get("after")
+            if before is not None and after is not None and (before["date"], before["id"]) == (after["date"], after["id"]):
+                i = self._index_of((after["date"], after["id"]))
+                if i is not None and self._matches(after):
+                    # same sort position: repaint the row in place
+                    self._cache_rows([after])
+                    self.dataChanged.emit(self.index(i, 0), self.index(i, self.columnCount() - 1))
+                    continue
+            if before is not None:
+                self._remove((before["date"], before["id"]))
+            if after is not None and self._matches(after):
+                self._insert(after)
+        return True
+
+    # ----- row access -----
+
+    def tx_id_at(self, row: int) -> Optional[int]:
+        if 0 <= row < len(self._keys):
+            return self._keys[row][1]
+        return None
+
+    def row_at(self, row: int) -> Optional[Dict]:
+        tx_id = self.tx_id_at(row)
+        if tx_id is None:
+            return None
+        if tx_id not in self._rows:
+            # evicted: re-read the page this row belongs to
+            start = row - row % self.page_size
+            if self._runner is not None:
+                self._refetch(start)  # never query while painting
+                return None
+            after = self._keys[start - 1] if start else None
+            self._cache_rows(self._query_page(self._filters, after, self.page_size))
+        data = self._rows.get(tx_id)
+        if data is not None:
+            self._rows.move_to_end(tx_id)
+        return data
+
+    # ----- QAbstractTableModel -----
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._keys)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        row = self.row_at(index.row())
+        if row is None:
+            return None
+        key = self.KEYS[index.column()]
+        if key == "amount":
+            return f"{row['amount']:.2f}"
+        return str(row.get(key, ""))
 
 
 class TransactionListPage(QWidget):
@@ -78,11 +344,13 @@ class TransactionListPage(QWidget):
 
         # === TABLE ===
         # include hidden ID column at index 0
-        self.table = QTableWidget(0, 8)
-        self.table.setHorizontalHeaderLabels(
-            ["ID", "Date", "Amount", "Type", "Category", "Payment", "Tags", "Note"]
-        )
+        self.model = TransactionTableModel(runner=default_runner(), parent=self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
         self.table.setColumnHidden(0, True)
+        self.table.verticalHeader().setDefaultSectionSize(28)
         self.table.horizontalHeader().setStretchLastSection(True)
 
         main_layout.addLayout(filter_layout)
@@ -125,38 +393,23 @@ class TransactionListPage(QWidget):
 
     # ----- table -----
 
-    def set_transactions(self, rows: List[Dict]):
-        self.table.setRowCount(0)
-        for row in rows:
-            r = self.table.rowCount()
-            self.table.insertRow(r)
-
-            # store id in hidden column
-            self.table.setItem(r, 0, QTableWidgetItem(str(row.get("id", ""))))
-
-            vals = [
-                row["date"],
-                f"{row['amount']:.2f}",
-                row["type"],
-                row["category"],
-                row["payment_method"],
-                row["tags"],
-                row["note"],
-            ]
-            for c, v in enumerate(vals, start=1):
-                self.table.setItem(r, c, QTableWidgetItem(str(v)))
+    def set_filters(self, filters: Optional[Dict] = None):
+        """Show transactions matching `filters` (None = all), paged on demand."""
+        self.model.set_filters(filters)
+
+    def reload(self):
+        """Re-query with the active filters."""
+        self.model.reload()
+
+    def apply_changes(self, changes: List[Dict]) -> bool:
+        """Patch single-row writes into the table; False means reload."""
+        return self.model.apply_changes(changes)
 
     def _selected_row_tx_id(self) -> Optional[int]:
-        r = self.table.currentRow()
+        r = self.table.currentIndex().row()
         if r < 0:
             return None
-        item = self.table.item(r, 0)
-        if not item:
-            return None
-        try:
-            return int(item.text())
-        except Exception:
-            return None
+        return self.model.tx_id_at(r)
 
     def open_edit_dialog(self):
         tx_id = self._selected_row_tx_id()
@@ -164,14 +417,16 @@ class TransactionListPage(QWidget):
             return
 
         # gather current values from row
-        r = self.table.currentRow()
-        date = self.table.item(r, 1).text()
-        amount = self.table.item(r, 2).text()
-        type_ = self.table.item(r, 3).text()
-        category = self.table.item(r, 4).text()
-        payment = self.table.item(r, 5).text()
-        tags = self.table.item(r, 6).text()
-        note = self.table.item(r, 7).text()
+        row = self.model.row_at(self.table.currentIndex().row())
+        if row is None:
+            return
+        date = row["date"]
+        amount = f"{row['amount']:.2f}"
+        type_ = row["type"]
+        category = row["category"]
+        payment = row["payment_method"]
+        tags = row["tags"]
+        note = row["note"]
 
         dlg = QDialog(self)
         dlg.setWindowTitle("Edit Transaction")
@@ -224,9 +479,8 @@ class TransactionListPage(QWidget):
                 }
                 ok = update_transaction(tx_id, data)
                 if ok:
+                    # the main window's refresh coordinator reloads the list
                     dlg.accept()
-                    # refresh parent list via filters
-                    self.apply_filters()
                 else:
                     QMessageBox.warning(self, "Error", "Failed to update transaction.")
             except Exception:
@@ -247,7 +501,5 @@ class TransactionListPage(QWidget):
             return
 
         ok = delete_transaction(tx_id)
-        if ok:
-            self.apply_filters()
-        else:
+        if not ok:
             QMessageBox.warning(self, "Error", "Failed to delete transaction.")
@@ -0,0 +1,283 @@
+"""Deterministic demo / benchmark data.
+
+    python scripts/seed_demo.py [--db PATH] [-n 2000] [--seed 42] [--years 3]
+    python scripts/seed_demo.py --template -n 1000000   # build/print a template
+
+`generate` writes `n` transactions spread over the last `years` years, plus a
+budget for every expense category and a few recurring rules. The same seed,
+count and end date always produce the same rows. Amounts follow a per
+category log-normal distribution. Days are weighted by month (December
+shopping, summer travel, winter utilities) and by weekday (weekend eating
+out), and salary lands on the 25th.
+
+Rows are generated in memory, sorted by date (as if entered day by day) and
+written with one executemany per batch while the rollup triggers and the
+secondary indexes are suspended (both are rebuilt once at the end).
+
+`template_db` builds a database once per (n, seed, end) under
+`TEMPLATE_DIR` and returns its path; benchmarks and tests copy it with
+`copy_template` instead of regenerating.
+"""
+import argparse
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from itertools import accumulate, repeat
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+if __package__ in (None, ""):
+    # run as `python scripts/seed_demo.py`
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Engine
+
+from db.connection import create_db_engine, resolve_db_path
+from db.migrations import run_migrations
+from db.models import Base, Budget, Category, RecurringRule
+from db.rollups import suspended_triggers
+
+DEFAULT_SEED = 42
+DEFAULT_YEARS = 3
+INSERT_BATCH = 50_000
+TEMPLATE_DIR = os.environ.get("SPENT_TEMPLATE_DIR") or os.path.join(tempfile.gettempdir(), "spent-templates")
+
+PAYMENT_METHODS = ["Card", "Cash", "Bank transfer", "Mobile"]
+
+
+class _Profile:
+    """How one category's transactions look."""
+
+    def __init__(self, name, type_, share, median, spread, payment, tags=(), notes=(), months=None, weekdays=None, days=None):
+        self.name = name
+        self.type = type_
+        self.share = share            # relative number of transactions
+        self.median = median          # typical amount
+        self.spread = spread          # log-normal sigma
+        self.payment = payment        # weights over PAYMENT_METHODS
+        self.tags = tags
+        self.notes = notes
+        self.months = months or {}    # month -> frequency factor
+        self.weekdays = weekdays or {}  # weekday (0 = Monday) -> frequency factor
+        self.days = days              # only these days of the month
+
+
+PROFILES = [
+    _Profile("Food", "expense", 40, 18, 0.7, (6, 3, 0, 2), ("groceries", "restaurant", "coffee", ""),
+             ("Supermarket", "Lunch", "Coffee", "Takeaway", "Bakery"), weekdays={4: 1.4, 5: 1.6, 6: 1.2}),
+    _Profile("Transport", "expense", 18, 12, 0.8, (5, 2, 0, 3), ("commute", "fuel", "taxi", ""),
+             ("Metro card", "Fuel", "Taxi", "Parking"), weekdays={5: 0.5, 6: 0.4}),
+    _Profile("Shopping", "expense", 12, 45, 1.0, (8, 1, 0, 1), ("clothes", "electronics", "gift", ""),
+             ("Online order", "Clothes", "Gift", "Household"), months={11: 1.4, 12: 2.0, 1: 1.2}),
+    _Profile("Entertainment", "expense", 8, 25, 0.8, (7, 2, 0, 1), ("movies", "games", "music", ""),
+             ("Cinema", "Concert", "Streaming", "Game"), weekdays={4: 1.3, 5: 1.5}),
+    _Profile("Utilities", "expense", 3, 85, 0.4, (2, 0, 8, 0), ("bills",),
+             ("Electricity", "Water", "Internet", "Gas"), months={12: 1.3, 1: 1.4, 2: 1.3}),
+    _Profile("Health", "expense", 3, 40, 0.9, (6, 2, 0, 1), ("pharmacy", "doctor", ""),
+             ("Pharmacy", "Dentist", "Doctor"), months={1: 1.3, 2: 1.3, 12: 1.1}),
+    _Profile("Travel", "expense", 2, 220, 1.1, (9, 1, 2, 0), ("vacation", "hotel", "flight"),
+             ("Hotel", "Flights", "Train tickets"), months={6: 1.8, 7: 2.5, 8: 2.5, 12: 1.4}),
+    _Profile("General", "expense", 5, 20, 1.0, (5, 3, 1, 1), ("",), ("Misc",)),
+    _Profile("Salary", "income", 1, 3200, 0.05, (0, 0, 1, 0), ("work",), ("Monthly salary",), days=(25,)),
+    _Profile("Freelance", "income", 1, 450, 0.7, (0, 0, 3, 1), ("work", "side"), ("Invoice", "Consulting")),
+    _Profile("Other", "income", 1, 60, 1.0, (1, 2, 1, 1), ("",), ("Refund", "Gift", "Sale")),
+]
+
+RECURRING_RULES = [
+    ("expense", 1150.0, "Rent", "Bank transfer", "home", "Rent", "monthly", 1),
+    ("expense", 11.99, "Entertainment", "Card", "subscription", "Streaming", "monthly", 1),
+    ("expense", 35.0, "Health", "Card", "gym", "Gym membership", "monthly", 1),
+    ("expense", 20.0, "Transport", "Mobile", "commute", "Weekly pass", "weekly", 1),
+    ("income", 3200.0, "Salary", "Bank transfer", "work", "Monthly salary", "monthly", 1),
+]
+
+
+def _ensure_categories(conn, names_types: List[Tuple[str, str]]) -> Dict[str, int]:
+    existing = {(n, t): i for i, n, t in conn.execute(select(Category.id, Category.name, Category.type)).all()}
+    missing = [{"name": n, "type": t} for n, t in names_types if (n, t) not in existing]
+    if missing:
+        conn.execute(insert(Category), missing)
+        existing = {(n, t): i for i, n, t in conn.execute(select(Category.id, Category.name, Category.type)).all()}
+    return {n: existing[(n, t)] for n, t in names_types}
+
+
+@contextmanager
+def _suspended_indexes(conn) -> Iterator[None]:
+    """Drop the secondary indexes on transactions for a bulk load and
+    recreate them afterwards (one sorted build instead of per-row updates)."""
+    indexes = conn.exec_driver_sql(
+        "SELECT name, sql FROM sqlite_master "
+        "WHERE type = 'index' AND tbl_name = 'transactions' AND sql IS NOT NULL"
+    ).all()
+    for name, _sql in indexes:
+        conn.exec_driver_sql(f"DROP INDEX {name}")
+    try:
+        yield
+    finally:
+        for _name, sql in indexes:
+            conn.exec_driver_sql(sql)
+
+
+def _day_weights(profile: _Profile, days: List[date]) -> List[float]:
+    weights = []
+    for d in days:
+        if profile.days is not None and d.day not in profile.days:
+            weights.append(0.0)
+            continue
+        weights.append(profile.months.get(d.month, 1.0) * profile.weekdays.get(d.weekday(), 1.0))
+    return weights
+
+
+def generate_rows(n: int, seed: int = DEFAULT_SEED, end: Optional[date] = None, years: int = DEFAULT_YEARS,
+                  category_ids: Optional[Dict[str, int]] = None) -> List[tuple]:
+    """`n` transaction tuples (date, amount, type, category_id,
+    payment_method, tags, note), oldest first."""
+    end = end or date.today()
+    start = end - timedelta(days=365 * years - 1)
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    day_strings = [d.isoformat() for d in days]
+    category_ids = category_ids or {p.name: i for i, p in enumerate(PROFILES, 1)}
+
+    rnd = random.Random(seed)
+    per_profile = [0] * len(PROFILES)
+    for i in rnd.choices(range(len(PROFILES)), weights=[p.share for p in PROFILES], k=n):
+        per_profile[i] += 1
+
+    rows: List[tuple] = []
+    for profile, count in zip(PROFILES, per_profile):
+        if not count:
+            continue
+        mu, sigma, lognorm = math.log(profile.median), profile.spread, rnd.lognormvariate
+        rows.extend(zip(
+            rnd.choices(day_strings, cum_weights=list(accumulate(_day_weights(profile, days))), k=count),
+            [round(lognorm(mu, sigma), 2) for _ in range(count)],
+            repeat(profile.type, count),
+            repeat(category_ids[profile.name], count),
+            rnd.choices(PAYMENT_METHODS, weights=profile.payment, k=count),
+            [tag or None for tag in rnd.choices(profile.tags, k=count)],
+            rnd.choices(profile.notes, k=count),
+        ))
+    rows.sort(key=itemgetter(0))
+    return rows
+
+
+def generate(engine: Engine, n: int, seed: int = DEFAULT_SEED, end: Optional[date] = None,
+             years: int = DEFAULT_YEARS) -> Dict[str, int]:
+    """Add `n` transactions plus budgets and recurring rules to the database
+    behind `engine` (schema must exist). Returns what was written."""
+    end = end or date.today()
+    with engine.begin() as conn:
+        category_ids = _ensure_categories(conn, [(p.name, p.type) for p in PROFILES] + [("Rent", "expense")])
+    rows = generate_rows(n, seed, end, years, category_ids)
+
+    with engine.begin() as conn, suspended_triggers(conn):
+        with _suspended_indexes(conn):
+            for i in range(0, len(rows), INSERT_BATCH):
+                conn.exec_driver_sql(
+                    "INSERT INTO transactions (date, amount, type, category_id, payment_method, tags, note) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows[i:i + INSERT_BATCH],
+                )
+
+        # a budget ~10% above the average monthly spend of each expense category
+        months = max(1, years * 12)
+        spend: Dict[int, float] = {}
+        for r in rows:
+            if r[2] == "expense":
+                spend[r[3]] = spend.get(r[3], 0.0) + r[1]
+        budgeted = set(conn.execute(select(Budget.category_id)).scalars())
+        budgets = [
+            {"category_id": cid, "amount": round(total / months * 1.1, -1) or 10.0,
+             "cycle_day": 1, "created_at": end.isoformat()}
+            for cid, total in sorted(spend.items()) if cid not in budgeted
+        ]
+        if budgets:
+            conn.execute(insert(Budget), budgets)
+
+        # first occurrence after `end`, so opening the DB doesn't back-fill them
+        next_month = (end.replace(day=1) + timedelta(days=32)).replace(day=1)
+        conn.execute(insert(RecurringRule), [
+            {
+                "transaction_type": type_, "amount": amount, "category_id": category_ids[cat],
+                "payment_method": payment, "tags": tags, "note": note, "every": every, "interval": interval,
+                "next_date": (next_month if every == "monthly" else end + timedelta(days=7)).isoformat(),
+            }
+            for type_, amount, cat, payment, tags, note, every, interval in RECURRING_RULES
+        ])
+    return {"transactions": len(rows), "budgets": len(budgets), "recurring_rules": len(RECURRING_RULES)}
+
+
+def build(path: str, n: int, seed: int = DEFAULT_SEED, end: Optional[date] = None,
+          years: int = DEFAULT_YEARS) -> Dict[str, int]:
+    """Create a fresh database at `path` filled by `generate`."""
+    engine = create_db_engine(path, lambda: "fast")
+    try:
+        Base.metadata.create_all(engine)
+        run_migrations(engine)
+        result = generate(engine, n, seed, end, years)
+        with engine.connect() as conn:
+            conn.exec_driver_sql("ANALYZE")
+            conn.exec_driver_sql("PRAGMA journal_mode = DELETE")
+    finally:
+        engine.dispose()
+    return result
+
+
+def template_db(n: int, seed: int = DEFAULT_SEED, end: Optional[date] = None, directory: Optional[str] = None) -> str:
+    """Path of the template database for (n, seed, end), built on first use."""
+    end = end or date.today()
+    directory = directory or TEMPLATE_DIR
+    path = os.path.join(directory, f"demo-{n}-s{seed}-{end.isoformat()}.db")
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        fd, partial = tempfile.mkstemp(prefix=".template-", suffix=".db", dir=directory)
+        os.close(fd)
+        os.remove(partial)  # SQLite creates it
+        try:
+            build(partial, n, seed, end)
+            os.replace(partial, path)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+    return path
+
+
+def copy_template(n: int, dest_path: str, seed: int = DEFAULT_SEED, end: Optional[date] = None,
+                  directory: Optional[str] = None) -> str:
+    """Copy the (n, seed, end) template to `dest_path` and return it."""
+    shutil.copyfile(template_db(n, seed, end, directory), dest_path)
+    return dest_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill a database with realistic demo data")
+    parser.add_argument("--db", help="database file (default: $SPENT_DB or ./spent.db)")
+    parser.add_argument("-n", "--transactions", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--years", type=int, default=DEFAULT_YEARS)
+    parser.add_argument("--template", action="store_true", help="build (or reuse) a template DB and print its path")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    if args.template:
+        print(template_db(args.transactions, args.seed))
+        return
+
+    import db.repository as repo
+
+    path = repo.configure_database(args.db or resolve_db_path())
+    repo.init_db(apply_recurring=False)
+    result = generate(repo.engine, args.transactions, args.seed, years=args.years)
+    print(f"{path}: added {result['transactions']:,} transactions, {result['budgets']} budgets and "
+          f"{result['recurring_rules']} recurring rules in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
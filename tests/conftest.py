@@ -0,0 +1,22 @@
+import os
+
+import pytest
+
+import db.repository as repo
+
+
+@pytest.fixture(autouse=True)
+def isolated_db():
+    """Every test gets its own in-memory database instead of ./spent.db."""
+    repo.configure_database(":memory:")
+    yield
+    repo.engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """A headless QApplication for widget and model tests."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,49 @@
+from collections import defaultdict
+
+import pytest
+
+import db.repository as repo
+from db.aggregation import build_aggregate_query
+
+
+def _seed():
+    repo.init_db()
+    repo.import_transactions([
+        {"date": "2024-01-05", "amount": 10.0, "type": "expense", "category": "Food", "payment_method": "Cash"},
+        {"date": "2024-01-20", "amount": 100.0, "type": "income", "category": "Salary"},
+        {"date": "2024-02-01", "amount": 7.5, "type": "expense", "category": "Transport", "payment_method": "Card"},
+        {"date": "2024-02-01", "amount": 2.5, "type": "expense", "category": "Food", "payment_method": "Card"},
+    ])
+
+
+def test_report_wrappers_match_python_totals():
+    _seed()
+    rows = repo.list_transactions()
+
+    by_cat = defaultdict(float)
+    months = defaultdict(lambda: {"income": 0.0, "expense": 0.0})
+    for r in rows:
+        months[r["date"][:7]][r["type"]] += r["amount"]
+        if r["type"] == "expense":
+            by_cat[r["category"]] += r["amount"]
+
+    assert repo.get_expense_by_category_summary() == pytest.approx(dict(by_cat))
+
+    monthly = repo.get_monthly_income_expense_summary()
+    assert [m["month"] for m in monthly] == sorted(months)
+    for m in monthly:
+        assert m["income"] == pytest.approx(months[m["month"]]["income"])
+        assert m["expense"] == pytest.approx(months[m["month"]]["expense"])
+
+    balance, expected = 0.0, {}
+    for r in sorted(rows, key=lambda r: (r["date"], r["id"])):
+        balance += r["amount"] if r["type"] == "income" else -r["amount"]
+        expected[r["date"]] = balance
+    series = repo.get_balance_timeseries()
+    assert [p["date"] for p in series] == sorted(expected)
+    assert [p["balance"] for p in series] == pytest.approx([expected[d] for d in sorted(expected)])
+
+
+def test_unknown_dimension_is_rejected():
+    with pytest.raises(ValueError):
+        build_aggregate_query(["weekday"])
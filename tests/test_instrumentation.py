@@ -0,0 +1,66 @@
+import logging
+
+import pytest
+
+import db.repository as repo
+from db import instrumentation
+
+
+@pytest.fixture(autouse=True)
+def tracing_off_afterwards():
+    instrumentation.reset_query_stats()
+    yield
+    instrumentation.configure(False, instrumentation.DEFAULT_SLOW_MS)
+    instrumentation.reset_query_stats()
+
+
+def test_off_by_default_installs_no_hooks():
+    repo.init_db()
+    assert not instrumentation.is_enabled()
+    repo.count_transactions()
+    assert instrumentation.query_stats() == {}
+
+
+def test_statements_attributed_to_the_repository_entry_point(caplog):
+    repo.init_db()
+    repo.add_transaction({"date": "2024-01-02", "amount": 5.0, "type": "expense", "category": "Food"})
+    repo.set_sql_trace(True, slow_ms=0, persist=False)  # everything counts as slow
+
+    with caplog.at_level(logging.WARNING, logger="spent.sql.slow"):
+        repo.count_transactions(type_="expense")        # behind the query cache wrapper
+        repo.get_budgets_with_status()                   # via a private helper
+        repo.list_transactions_page(limit=10)
+
+    stats = instrumentation.query_stats()
+    assert stats["count_transactions"]["count"] == 1
+    assert stats["get_budgets_with_status"]["count"] == 1
+    assert stats["list_transactions_page"]["slow"] == stats["list_transactions_page"]["count"] >= 1
+    assert "wrapper" not in stats and "_budgets_with_status" not in stats
+
+    slow = instrumentation.slow_queries()
+    page_query = next(q for q in slow if q["function"] == "list_transactions_page")
+    assert page_query["statement"].startswith("SELECT")
+    assert any("ix_transactions_date_id" in line or "SCAN" in line for line in page_query["plan"])
+    assert "slow query" in caplog.text and "list_transactions_page" in caplog.text
+
+    repo.set_sql_trace(False, persist=False)
+    instrumentation.reset_query_stats()
+    repo.count_transactions(type_="income")
+    assert instrumentation.query_stats() == {}
+
+
+def test_setting_and_environment(monkeypatch):
+    repo.init_db()
+    repo.set_sql_trace(True, slow_ms=250)
+    instrumentation.configure(False)
+    repo.init_db()  # stored settings are applied again
+    assert instrumentation.is_enabled() and instrumentation.slow_query_ms() == 250
+
+    monkeypatch.setenv(instrumentation.TRACE_ENV, "0")
+    instrumentation.configure_from_env()
+    repo.init_db()  # the environment wins over the stored setting
+    assert not instrumentation.is_enabled()
+
+    monkeypatch.setenv(instrumentation.TRACE_ENV, "on")
+    monkeypatch.setenv(instrumentation.SLOW_MS_ENV, "12.5")
+    assert instrumentation.settings_from_env() == (True, 12.5)
@@ -0,0 +1,55 @@
+from sqlalchemy import create_engine, text
+
+from db.migrations import run_migrations, get_schema_version, LATEST_VERSION
+
+
+def test_migrations_upgrade_legacy_db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}", future=True)
+    # schema as created by releases without indexes
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE transactions (id INTEGER PRIMARY KEY, date VARCHAR(10) NOT NULL, "
+            "amount FLOAT NOT NULL, type VARCHAR(20) NOT NULL, category_id INTEGER, "
+            "payment_method VARCHAR(50), tags VARCHAR(255), note TEXT, recurring_id INTEGER)"
+        ))
+        conn.execute(text("CREATE TABLE recurring_rules (id INTEGER PRIMARY KEY)"))
+
+    assert run_migrations(engine) == LATEST_VERSION
+    # second run is a no-op
+    assert run_migrations(engine) == 0
+
+    with engine.connect() as conn:
+        assert get_schema_version(conn) == LATEST_VERSION
+        names = {row[1] for row in conn.execute(text("PRAGMA index_list(transactions)"))}
+
+    assert {
+        "ix_transactions_date_id",
+        "ix_transactions_type_category_date",
+        "ux_transactions_recurring_date",
+    } <= names
+
+
+def test_recurring_migration_detaches_colliding_occurrences(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}", future=True)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE transactions (id INTEGER PRIMARY KEY, date VARCHAR(10) NOT NULL, "
+            "amount FLOAT NOT NULL, type VARCHAR(20) NOT NULL, category_id INTEGER, "
+            "payment_method VARCHAR(50), tags VARCHAR(255), note TEXT, recurring_id INTEGER)"
+        ))
+        conn.execute(text("CREATE TABLE recurring_rules (id INTEGER PRIMARY KEY)"))
+        conn.execute(text("INSERT INTO recurring_rules (id) VALUES (1)"))
+        # rule 1 was deleted and its id reused: Rent and Gym rows share recurring_id 1
+        conn.execute(text(
+            "INSERT INTO transactions (id, date, amount, type, category_id, note, recurring_id) VALUES "
+            "(1, '2024-01-01', 900, 'expense', 1, 'Rent', 1), "
+            "(2, '2024-02-01', 900, 'expense', 1, 'Rent', 1), "
+            "(3, '2024-01-01', 30, 'expense', 2, 'Gym', 1), "
+            "(4, '2024-02-01', 30, 'expense', 2, 'Gym', 1)"
+        ))
+
+    run_migrations(engine)
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT id, recurring_id FROM transactions ORDER BY id")).all()
+    assert rows == [(1, 1), (2, 1), (3, None), (4, None)]
@@ -0,0 +1,36 @@
+import pytest
+
+from gui import perf
+
+
+@pytest.fixture(autouse=True)
+def clean_stages():
+    perf.reset_stage_stats()
+    yield
+    perf.reset_stage_stats()
+
+
+def test_timed_and_measure_accumulate_per_stage():
+    @perf.timed("work")
+    def work(x):
+        return x * 2
+
+    assert work(2) == 4
+    work(3)
+    with perf.measure("block"):
+        pass
+
+    stats = perf.stage_stats()
+    assert stats["work"]["count"] == 2
+    assert stats["work"]["total"] >= stats["work"]["max"] >= 0
+    assert stats["block"]["count"] == 1
+
+
+def test_failing_call_is_still_recorded():
+    @perf.timed("boom")
+    def boom():
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        boom()
+    assert perf.stage_stats()["boom"]["count"] == 1
@@ -0,0 +1,26 @@
+import pytest
+from sqlalchemy import create_engine
+
+from db import pragmas
+
+
+@pytest.mark.parametrize("profile, journal_mode, synchronous", [
+    ("safe", "delete", 2),
+    ("balanced", "wal", 1),
+    ("fast", "wal", 0),
+])
+def test_profile_pragmas_applied_on_connect(tmp_path, profile, journal_mode, synchronous):
+    engine = create_engine(f"sqlite:///{tmp_path / 'p.db'}", future=True)
+    pragmas.install(engine, lambda: profile)
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == journal_mode
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == synchronous
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+    engine.dispose()
+
+
+def test_unknown_profile_rejected(monkeypatch):
+    with pytest.raises(ValueError):
+        pragmas.validate_profile("turbo")
+    monkeypatch.setenv(pragmas.PROFILE_ENV, "turbo")
+    assert pragmas.profile_from_env() is None
@@ -0,0 +1,131 @@
+import time
+
+import pytest
+
+import db.repository as repo
+
+
+def settle(app, window=None, timeout=10.0):
+    from gui.async_query import default_runner
+
+    runner = default_runner()
+    deadline = time.perf_counter() + timeout
+    while runner.busy() or (window is not None and window.refresh.has_pending()):
+        app.processEvents()
+        time.sleep(0.001)
+        assert time.perf_counter() < deadline, "GUI did not settle"
+    app.processEvents()
+
+
+def add(day, amount=10.0, type_="expense", category="RefreshCat"):
+    return repo.add_transaction({
+        "date": f"2025-07-{day:02d}", "amount": amount, "type": type_, "category": category,
+    })
+
+
+@pytest.fixture
+def pages(qapp):
+    from PySide6.QtWidgets import QStackedWidget, QWidget
+
+    from gui.refresh import RefreshCoordinator
+
+    repo.init_db()
+    stack = QStackedWidget()
+    shown, hidden = QWidget(), QWidget()
+    stack.addWidget(shown)
+    stack.addWidget(hidden)
+    coordinator = RefreshCoordinator(stack)
+    calls = []
+    for name, page in (("shown", shown), ("hidden", hidden), ("global", None)):
+        coordinator.register(name, ("transactions",), lambda name=name: calls.append(name), page)
+    yield coordinator, shown, hidden, calls
+    coordinator.detach()
+
+
+def test_writes_are_coalesced_and_only_visible_targets_refresh(pages):
+    coordinator, shown, hidden, calls = pages
+    add(1)
+    add(2)
+    assert coordinator.has_pending()
+    assert calls == []
+
+    coordinator.flush()
+    assert sorted(calls) == ["global", "shown"]
+    assert not coordinator.has_pending()
+
+    # the hidden page catches up once, when it is shown
+    calls.clear()
+    coordinator.page_shown(hidden)
+    coordinator.page_shown(hidden)
+    assert calls == ["hidden"]
+
+
+def test_delta_targets_skip_the_reload_unless_stale(pages):
+    coordinator, shown, hidden, calls = pages
+    deltas = []
+
+    def apply_delta(changes):
+        deltas.append(changes)
+        return True
+
+    coordinator.register("patched", ("transactions",), lambda: calls.append("patched"), hidden, apply_delta)
+    add(1)
+    assert len(deltas) == 1
+    coordinator.flush()
+    assert "patched" not in calls
+
+    # a bulk write has no row changes: reload (stale, since its page is hidden)
+    repo.import_transactions([{"date": "2025-07-03", "amount": 1, "type": "expense", "category": "RefreshCat"}])
+    coordinator.flush()
+    assert "patched" not in calls
+
+    # while stale, deltas aren't offered: the pending reload covers them
+    add(4)
+    assert len(deltas) == 1
+    coordinator.flush()
+    coordinator.page_shown(hidden)
+    assert calls.count("patched") == 1
+
+
+def test_main_window_patches_dashboard_and_totals_in_place(qapp):
+    from gui.main_window import DASHBOARD_RECENT_LIMIT, MainWindow, _load_dashboard_data
+
+    repo.init_db(apply_recurring=False)
+    for day in range(1, DASHBOARD_RECENT_LIMIT + 2):
+        add(day)
+    window = MainWindow()
+    try:
+        window.btn_dashboard.click()
+        settle(qapp, window)
+
+        def assert_current():
+            recent, cat_totals = window._dashboard_data
+            expected_recent, expected_totals = _load_dashboard_data()
+            assert [r["id"] for r in recent] == [r["id"] for r in expected_recent]
+            assert cat_totals == pytest.approx(expected_totals)
+            assert window._totals == pytest.approx(repo.get_totals())
+
+        def reload_scheduled():
+            return {"dashboard", "header_totals"} & window.refresh._dirty
+
+        new = add(20, amount=5.0)
+        assert not reload_scheduled()  # patched in place
+        assert_current()
+
+        repo.update_transaction(new["id"], {"date": "2025-06-30", "type": "income"})
+        settle(qapp, window)
+        assert_current()
+
+        # deleting a shown row from a full list can't be patched: the next
+        # newest row isn't known, so the dashboard reloads
+        recent, _ = window._dashboard_data
+        assert not window._apply_dashboard_delta([{"before": recent[0], "after": None}])
+        repo.delete_transaction(recent[0]["id"])
+        assert reload_scheduled() == {"dashboard"}
+        settle(qapp, window)
+        assert_current()
+    finally:
+        window.refresh.detach()
+        window.close()
+        window.deleteLater()
+        settle(qapp)
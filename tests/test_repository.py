@@ -1,4 +1,8 @@
+import gzip
+import json
 import os
+import uuid
+from datetime import date
 
 import db.repository as repo
 
@@ -30,3 +34,186 @@ def test_export_import_csv(tmp_path):
     # importing back should return an int (number of rows imported)
     imported = repo.import_transactions_csv(str(out))
     assert isinstance(imported, int)
+
+
+def test_bulk_import_batches_and_skips_bad_rows():
+    repo.init_db()
+    before = len(repo.list_transactions())
+    batches = []
+
+    rows = [
+        {"date": "2025-02-01", "amount": i, "type": "expense", "category": "BulkCat"}
+        for i in range(5)
+    ]
+    rows.insert(2, {"date": "2025-02-01", "amount": "not a number", "type": "expense", "category": "BulkCat"})
+    rows.insert(4, {"date": None, "amount": 1, "type": "expense", "category": "BulkCat"})
+    rows.insert(5, {"date": "2025-02-01", "amount": 1, "type": None, "category": "BulkCat"})
+
+    imported = repo.import_transactions(rows, batch_size=2, progress=batches.append)
+
+    assert imported == 5
+    assert batches == [2, 4, 5]
+    assert len(repo.list_transactions()) == before + 5
+
+
+def test_export_ndjson_gzip_roundtrip(tmp_path):
+    repo.init_db()
+    out = tmp_path / "out.ndjson.gz"
+    repo.export_transactions_ndjson(str(out), chunk_size=2)
+
+    with gzip.open(out, "rt", encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert lines == repo.list_transactions()
+
+    assert repo.import_transactions_ndjson(str(out)) == len(lines)
+
+
+def test_export_json_streams_same_layout_as_json_dump(tmp_path):
+    repo.init_db()
+    out = tmp_path / "out.json.gz"
+    repo.export_transactions_json(str(out), chunk_size=3)
+
+    with gzip.open(out, "rt", encoding="utf-8") as f:
+        text = f.read()
+    assert text == json.dumps(repo.list_transactions(), ensure_ascii=False, indent=2)
+
+
+def test_keyset_pages_match_full_listing():
+    repo.init_db()
+    for day in (3, 1, 3, 2):
+        repo.add_transaction({
+            "date": f"2024-06-0{day}",
+            "amount": 1.0,
+            "type": "income",
+            "category": "PageCat",
+        })
+
+    expected = repo.filter_transactions(category="PageCat")
+    assert repo.count_transactions(category="PageCat") == len(expected)
+
+    pages, after = [], None
+    while True:
+        page = repo.list_transactions_page(limit=3, after=after, category="PageCat")
+        if not page:
+            break
+        pages.extend(page)
+        after = (page[-1]["date"], page[-1]["id"])
+
+    assert pages == sorted(expected, key=lambda r: (r["date"], r["id"]), reverse=True)
+    assert repo.count_transactions() == len(repo.list_transactions())
+
+
+def test_budget_status_sums_current_cycle_only():
+    repo.init_db()
+    name = f"BudgetCat {uuid.uuid4().hex[:8]}"
+    repo.create_category(name, "expense")
+    cat_id = next(c["id"] for c in repo.get_categories("expense") if c["name"] == name)
+    repo.create_budget(cat_id, 100.0, 10)
+    repo.import_transactions([
+        {"date": "2025-03-09", "amount": 40.0, "type": "expense", "category": name},  # previous cycle
+        {"date": "2025-03-10", "amount": 70.0, "type": "expense", "category": name},
+        {"date": "2025-04-09", "amount": 50.0, "type": "expense", "category": name},
+        {"date": "2025-04-10", "amount": 99.0, "type": "expense", "category": name},  # next cycle
+    ])
+
+    status = next(
+        b for b in repo.get_budgets_with_status(date(2025, 3, 20)) if b["category_id"] == cat_id
+    )
+    assert status["spent"] == 120.0
+    assert status["remaining"] == -20.0
+    assert status["overspent"] is True
+
+
+def test_single_row_writes_return_rows_and_report_changes():
+    repo.init_db()
+    seen = []
+    listener = lambda domain, changes: seen.append((domain, changes))
+    repo.add_write_listener(listener)
+    try:
+        added = repo.add_transaction({"date": "2024-02-02", "amount": 4.0, "type": "expense", "category": "Food"})
+        updated = repo.update_transaction(added["id"], {"amount": 6.0})
+        deleted = repo.delete_transaction(added["id"])
+    finally:
+        repo.remove_write_listener(listener)
+
+    assert added["amount"] == 4.0 and added["category"] == "Food"
+    assert updated == {**added, "amount": 6.0}
+    assert deleted == updated
+    assert repo.delete_transaction(added["id"]) is None
+
+    changes = [c for domain, c in seen if domain == "transactions"]
+    assert changes == [
+        [{"before": None, "after": added}],
+        [{"before": added, "after": updated}],
+        [{"before": updated, "after": None}],
+    ]
+
+
+def test_query_cache_hits_until_a_write():
+    repo.init_db()
+    repo.get_totals()
+    before = repo.cache_stats()
+    income, expense, _ = repo.get_totals()
+    assert repo.cache_stats()["hits"] == before["hits"] + 1
+
+    repo.add_transaction({"date": "2024-03-03", "amount": 2.5, "type": "expense", "category": "Food"})
+    assert repo.cache_stats()["version"] > before["version"]
+    assert repo.get_totals()[1] == expense + 2.5
+
+    # callers get copies: mutating a result doesn't poison the cache
+    repo.get_categories().clear()
+    assert repo.get_categories()
+
+
+def test_backup_is_consistent_compressed_and_reports_progress(tmp_path):
+    repo.init_db()
+    repo.import_transactions(
+        {"date": "2024-05-05", "amount": float(i), "type": "expense", "category": "Food"} for i in range(500)
+    )
+    steps = []
+    out = tmp_path / "backup.db"
+    assert repo.backup_db(str(out), compress=True, progress=lambda done, total: steps.append((done, total)))
+
+    assert steps and steps[-1][0] == steps[-1][1]
+    restored = tmp_path / "restored.db"
+    with gzip.open(f"{out}.gz", "rb") as src:
+        restored.write_bytes(src.read())
+    repo.configure_database(str(restored))
+    assert repo.count_transactions() == 500
+
+
+def test_restore_swaps_database_in_place(tmp_path):
+    repo.configure_database(str(tmp_path / "live.db"))
+    repo.init_db()
+    repo.add_transaction({"date": "2024-06-01", "amount": 1.0, "type": "expense", "category": "Food"})
+    assert repo.backup_db(str(tmp_path / "b.db.gz"))
+
+    repo.add_transaction({"date": "2024-06-02", "amount": 2.0, "type": "expense", "category": "Food"})
+    assert repo.count_transactions() == 2
+
+    seen = []
+    listener = lambda domain, changes: seen.append(domain)
+    repo.add_write_listener(listener)
+    try:
+        assert repo.restore_db(str(tmp_path / "b.db.gz"))
+    finally:
+        repo.remove_write_listener(listener)
+    assert repo.count_transactions() == 1
+    assert set(repo.DOMAINS) <= set(seen)
+
+    # an invalid file leaves the live database untouched
+    (tmp_path / "junk.db").write_bytes(b"not a database")
+    assert not repo.restore_db(str(tmp_path / "junk.db"))
+    assert repo.count_transactions() == 1
+    assert not [p for p in os.listdir(tmp_path) if p.startswith(".spent-restore-")]
+
+
+def test_db_stats_reports_size_and_row_counts():
+    repo.init_db()
+    repo.add_transaction({"date": "2024-03-01", "amount": 9.0, "type": "expense", "category": "Food"})
+    stats = repo.get_db_stats()
+    assert stats["path"] == ":memory:"
+    assert stats["size_bytes"] > 0 and stats["wal_bytes"] == 0
+    assert stats["tables"]["transactions"] == 1
+    assert stats["tables"]["categories"] == len(repo.DEFAULT_CATEGORIES)
+    assert stats["tables"]["monthly_rollups"] == 1
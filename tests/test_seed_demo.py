@@ -0,0 +1,58 @@
+import os
+import sqlite3
+from datetime import date
+
+import db.repository as repo
+from scripts import seed_demo
+
+END = date(2025, 6, 30)
+
+
+def test_generated_rows_are_deterministic_and_seasonal():
+    rows = seed_demo.generate_rows(20000, seed=7, end=END)
+    assert rows == seed_demo.generate_rows(20000, seed=7, end=END)
+    assert rows != seed_demo.generate_rows(20000, seed=8, end=END)
+
+    assert [r[0] for r in rows] == sorted(r[0] for r in rows)
+    assert "2022-07-01" <= rows[0][0] and rows[-1][0] <= END.isoformat()
+
+    salary_id = seed_demo.PROFILES.index(next(p for p in seed_demo.PROFILES if p.name == "Salary")) + 1
+    assert {r[0][8:] for r in rows if r[3] == salary_id} == {"25"}
+
+    travel_id = [p.name for p in seed_demo.PROFILES].index("Travel") + 1
+    travel_months = [int(r[0][5:7]) for r in rows if r[3] == travel_id]
+    assert travel_months.count(8) > 1.5 * travel_months.count(3)
+
+
+def test_generate_fills_every_domain_and_keeps_rollups_consistent():
+    repo.init_db(apply_recurring=False)
+    result = seed_demo.generate(repo.engine, 3000, end=END)
+
+    assert result["transactions"] == repo.count_transactions() == 3000
+    assert len(repo.get_budgets()) == result["budgets"] > 0
+    assert len(repo.list_recurring_rules()) == result["recurring_rules"]
+    assert all(r["next_date"] > END.isoformat() for r in repo.list_recurring_rules())
+
+    # rollups rebuilt after the trigger-less bulk load match a from-scratch rebuild
+    summary = repo.get_expense_by_category_summary()
+    repo.rebuild_monthly_rollups()
+    assert repo.get_expense_by_category_summary() == summary
+
+
+def test_template_is_built_once_and_copied(tmp_path):
+    path = seed_demo.template_db(500, end=END, directory=str(tmp_path))
+    mtime = os.stat(path).st_mtime_ns
+    assert seed_demo.template_db(500, end=END, directory=str(tmp_path)) == path
+    assert os.stat(path).st_mtime_ns == mtime
+
+    copy = str(tmp_path / "copy.db")
+    seed_demo.copy_template(500, copy, end=END, directory=str(tmp_path))
+    assert os.stat(path).st_mtime_ns == mtime
+
+    conn = sqlite3.connect(copy)
+    try:
+        assert conn.execute("SELECT count(*) FROM transactions").fetchone()[0] == 500
+        indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert "ix_transactions_type_category_date" in indexes
+    finally:
+        conn.close()
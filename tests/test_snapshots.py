@@ -0,0 +1,45 @@
+import os
+
+import db.repository as repo
+from db import snapshots
+
+
+def _store_bytes(store):
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _dirs, files in os.walk(os.path.join(store, "chunks"))
+        for name in files
+    )
+
+
+def test_snapshots_dedupe_restore_and_prune(tmp_path):
+    repo.configure_database(str(tmp_path / "live.db"))
+    repo.init_db()
+    repo.import_transactions(
+        {"date": f"2024-01-{i % 28 + 1:02d}", "amount": float(i), "type": "expense", "category": "Food", "note": "x" * 200}
+        for i in range(5000)
+    )
+    store = str(tmp_path / "snaps")
+
+    first = repo.snapshot_db(store)
+    assert first["chunk_count"] > 50 and first["new_chunks"] > 0
+
+    repo.add_transaction({"date": "2024-02-01", "amount": 1.0, "type": "income", "category": "Salary"})
+    second = repo.snapshot_db(store)
+    # a one-row edit only touches a few pages
+    assert 0 < second["new_chunks"] <= 10
+    assert second["new_bytes"] < first["new_bytes"] // 10
+
+    assert repo.restore_db_snapshot(first["id"], store)
+    assert repo.count_transactions() == 5000
+    assert repo.restore_db_snapshot(second["id"], store)
+    assert repo.count_transactions() == 5001
+
+    before = _store_bytes(store)
+    result = repo.prune_db_snapshots(keep_last=1, keep_daily=0, store_dir=store)
+    assert result["removed_snapshots"] == 1
+    assert result["freed_chunks"] > 0
+    assert _store_bytes(store) == before - result["freed_bytes"]
+    assert [s["id"] for s in snapshots.list_snapshots(store)] == [second["id"]]
+    assert repo.restore_db_snapshot(second["id"], store)
+    assert repo.count_transactions() == 5001
@@ -0,0 +1,148 @@
+import time
+
+import db.repository as repo
+from gui.async_query import QueryRunner
+from gui.transaction_list import TransactionTableModel
+
+
+def settle(app, runner, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while runner.busy():
+        app.processEvents()
+        time.sleep(0.001)
+        assert time.perf_counter() < deadline, "query did not finish"
+    app.processEvents()
+
+
+def add(day, amount=1.0, type_="expense", category="ModelCat"):
+    return repo.add_transaction({
+        "date": f"2025-05-{day:02d}", "amount": amount, "type": type_, "category": category,
+    })
+
+
+def model_ids(model):
+    return [model.tx_id_at(r) for r in range(model.rowCount())]
+
+
+def load_all(app, model):
+    while model.canFetchMore():
+        model.fetchMore()
+        if model._runner is not None:
+            settle(app, model._runner)
+
+
+def test_evicted_rows_are_refetched_in_the_background(qapp):
+    repo.init_db()
+    for day in range(1, 7):
+        add(day)
+    runner = QueryRunner()
+    model = TransactionTableModel(page_size=2, max_cached_rows=2, runner=runner)
+    model.set_filters({"category": "ModelCat"})
+    load_all(qapp, model)
+    assert model.rowCount() == 6
+
+    changed = []
+    model.dataChanged.connect(lambda first, last: changed.append((first.row(), last.row())))
+
+    # row 0 was evicted by the later pages: painting it must not query inline
+    assert model.data(model.index(0, 1)) is None
+    assert runner.busy()
+    settle(qapp, runner)
+
+    assert changed == [(0, 1)]
+    assert model.data(model.index(0, 1)) == "2025-05-06"
+
+
+class Recorder:
+    """Collects the row changes repository writes report."""
+
+    def __init__(self):
+        self.changes = []
+        repo.add_write_listener(self)
+
+    def __call__(self, domain, changes):
+        if domain == "transactions":
+            self.changes.append(changes)
+
+    def take(self):
+        (changes,) = self.changes  # exactly one write
+        self.changes = []
+        return changes
+
+    def close(self):
+        repo.remove_write_listener(self)
+
+
+def db_ids(**filters):
+    return [r["id"] for r in repo.list_transactions_page(limit=1000, **filters)]
+
+
+def test_deltas_keep_the_model_in_step_with_the_database(qapp):
+    repo.init_db()
+    rows = [add(day) for day in (2, 4, 6, 8)]
+    model = TransactionTableModel(page_size=2)
+    model.set_filters({"category": "ModelCat"})
+    load_all(qapp, model)
+    recorder = Recorder()
+    try:
+        # add between existing rows
+        add(5)
+        assert model.apply_changes(recorder.take())
+        assert model_ids(model) == db_ids(category="ModelCat")
+
+        # edit that moves the oldest row to the top
+        repo.update_transaction(rows[0]["id"], {"date": "2025-05-09", "note": "moved"})
+        assert model.apply_changes(recorder.take())
+        assert model_ids(model) == db_ids(category="ModelCat")
+        assert model.row_at(0)["note"] == "moved"
+
+        # edit in place repaints the row
+        repo.update_transaction(rows[2]["id"], {"amount": 7.5})
+        assert model.apply_changes(recorder.take())
+        assert model.row_at(model_ids(model).index(rows[2]["id"]))["amount"] == 7.5
+
+        # delete
+        repo.delete_transaction(rows[1]["id"])
+        assert model.apply_changes(recorder.take())
+        assert model_ids(model) == db_ids(category="ModelCat")
+    finally:
+        recorder.close()
+
+
+def test_edit_that_no_longer_matches_the_filters_removes_the_row(qapp):
+    repo.init_db()
+    rows = [add(day) for day in (1, 2, 3)]
+    model = TransactionTableModel()
+    model.set_filters({"category": "ModelCat", "type": "Expense"})
+    load_all(qapp, model)
+    recorder = Recorder()
+    try:
+        repo.update_transaction(rows[1]["id"], {"type": "income"})
+        assert model.apply_changes(recorder.take())
+        assert model_ids(model) == db_ids(category="ModelCat", type_="expense") == [rows[2]["id"], rows[0]["id"]]
+
+        # an added row outside the filters isn't shown either
+        add(4, category="OtherCat")
+        assert model.apply_changes(recorder.take())
+        assert model_ids(model) == [rows[2]["id"], rows[0]["id"]]
+    finally:
+        recorder.close()
+
+
+def test_rows_past_the_loaded_pages_arrive_with_a_later_page(qapp):
+    repo.init_db()
+    for day in range(3, 9):
+        add(day)
+    model = TransactionTableModel(page_size=2)
+    model.set_filters({"category": "ModelCat"})
+    model.fetchMore()  # only the newest two rows are loaded
+    recorder = Recorder()
+    try:
+        add(1)  # sorts after everything loaded so far
+        assert model.apply_changes(recorder.take())
+        assert model.rowCount() == 2
+
+        load_all(qapp, model)
+        assert model_ids(model) == db_ids(category="ModelCat")
+    finally:
+        recorder.close()